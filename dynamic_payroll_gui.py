@@ -500,9 +500,9 @@ class DynamicPayrollGUIGenerator:
             self.root.after(0, self.populate_employee_tree)
             self.status_var.set('Generating PDFs...')
             success = 0
+            outdir = 'output_pdfs'
+            os.makedirs(outdir, exist_ok=True)
             for i, emp in enumerate(self.employee_data, 1):
-                outdir = 'output_pdfs'
-                os.makedirs(outdir, exist_ok=True)
                 seq = int(emp.get('seq') or 0) if str(emp.get('seq', '')).isdigit() else 0
                 clean = ''.join(c for c in emp.get('name', '') if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
                 fname = f'payslip_{seq:03d}_{clean}.pdf'
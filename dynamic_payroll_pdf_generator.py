@@ -1,4 +1,5 @@
 import csv
+import glob
 import os
 import re
 import sys
@@ -6,12 +7,15 @@ from datetime import datetime
 import shutil
 import subprocess
 import platform
-import time
 from email_store import EmailStore
 try:
     from openpyxl.worksheet.pagebreak import PageBreak  # openpyxl >= 3.1
 except Exception:
     PageBreak = None
+try:
+    from openpyxl.worksheet.pagebreak import RowBreaks, ColBreaks  # older openpyxl (<=3.0.x)
+except Exception:
+    RowBreaks = ColBreaks = None
 
 # Optional heavy dependencies may not be installed in the runtime used for quick GUI previews.
 # Import them conditionally and fall back so the preview/detection features remain usable.
@@ -23,9 +27,11 @@ pythoncom = None
 try:
     from openpyxl import load_workbook
     from openpyxl.styles import Font, Alignment, Border, Side
+    from openpyxl.worksheet.page import PageMargins
     HAS_OPENPYXL = True
 except Exception:
     load_workbook = None
+    PageMargins = None
 
 try:
     if platform.system().lower().startswith('win'):
@@ -592,11 +598,11 @@ class DynamicPayrollProcessor:
             'net_pay': net_pay
         }
 
-    def generate_pdf_payslip(self, employee, output_filename, withholding_placement='both'):
+    def generate_pdf_payslip(self, employee, output_filename, withholding_placement='both', tmp_dir=None):
         """Generate PDF payslip; prefer Excel template, else fallback to ReportLab."""
         if HAS_OPENPYXL and self.template_path:
             print(f"[template] Using: {self.template_path}")
-            ok = self.generate_pdf_from_excel_template(employee, output_filename, withholding_placement)
+            ok = self.generate_pdf_from_excel_template(employee, output_filename, withholding_placement, tmp_dir)
             if ok:
                 return True
             print("[template] Export failed; falling back to ReportLab.")
@@ -1126,9 +1132,10 @@ class DynamicPayrollProcessor:
 
         print("LibreOffice/Excel automation not available; cannot export template to PDF.")
         return False
-    def generate_pdf_from_excel_template(self, employee, output_filename, withholding_placement='both'):
+    def generate_pdf_from_excel_template(self, employee, output_filename, withholding_placement='both', tmp_dir=None):
         """
         Fill 'Template Payslip.xlsx' and export to a PDF that matches the Excel template exactly.
+        tmp_dir is an existing scratch folder for the filled XLSX; batch callers create it once.
         Falls back to False if openpyxl or the template is unavailable.
         """
         if not HAS_OPENPYXL or not os.path.exists(self.template_path):
@@ -1142,8 +1149,9 @@ class DynamicPayrollProcessor:
             self._excel_fill_template(ws, employee, withholding_placement)
 
             # Save a per-employee XLSX in a temp folder
-            tmp_dir = os.path.join("output_pdfs", "tmp")
-            os.makedirs(tmp_dir, exist_ok=True)
+            if tmp_dir is None:
+                tmp_dir = os.path.join("output_pdfs", "tmp")
+                os.makedirs(tmp_dir, exist_ok=True)
 
             seq_num = int(employee.get('seq')) if str(employee.get('seq', '')).isdigit() else 0
             clean_name = "".join(c for c in employee.get('name', '') if c.isalnum() or c in (' ', '-', '_')).rstrip()
@@ -1178,16 +1186,21 @@ class DynamicPayrollProcessor:
         # Step 3: Generate PDFs
         print(f"\nStep 3: Generating {len(self.employees)} PDF payslips...")
 
+        output_dir = os.path.abspath("output_pdfs")
+        os.makedirs(output_dir, exist_ok=True)
+        # Scratch folder for filled templates, created once for the whole run
+        tmp_dir = os.path.join(output_dir, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
         success_count = 0
         for i, employee in enumerate(self.employees, 1):
             # Create filename
             clean_name = "".join(c for c in employee['name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
             seq_num = int(employee['seq']) if employee['seq'].isdigit() else 0
             filename = f"payslip_{seq_num:03d}_{clean_name.replace(' ', '_')}.pdf"
-            filepath = os.path.join("output_pdfs", filename)
+            filepath = os.path.join(output_dir, filename)
 
             # Generate PDF
-            if self.generate_pdf_payslip(employee, filepath, withholding_placement):
+            if self.generate_pdf_payslip(employee, filepath, withholding_placement, tmp_dir):
                 success_count += 1
                 print(f"  [{i}/{len(self.employees)}] Generated: {filename}")
             else:
@@ -1195,13 +1208,13 @@ class DynamicPayrollProcessor:
 
         print("\n=== Processing Complete ===")
         print(f"Successfully generated {success_count}/{len(self.employees)} PDF payslips")
-        print(f"Output location: {os.path.abspath('output_pdfs')}")
+        print(f"Output location: {output_dir}")
         return success_count > 0
 
     # ----------------- Convenience: send all payslips -----------------
     def send_all_payslips(self, output_dir='output_pdfs', subject_tpl=None, body_tpl=None, throttle_seconds=0.5, dry_run=True, withholding_placement='both', progress_cb=None, force_regen=False):
         """
-        Generate PDFs (into output_dir) and send them via Mailer.send.
+        Generate PDFs (into output_dir) and send them via Mailer.send_many.
         Returns a list of dicts per employee: {name, seq, status, error, path}
         progress_cb, if provided, is called with a single string argument for progress messages.
         """
@@ -1212,10 +1225,15 @@ class DynamicPayrollProcessor:
 
         output_dir_abs = os.path.abspath(output_dir)
         os.makedirs(output_dir_abs, exist_ok=True)
+        # Scratch folder for filled templates, created once for the whole run
+        tmp_dir = os.path.abspath(os.path.join("output_pdfs", "tmp"))
+        os.makedirs(tmp_dir, exist_ok=True)
         results = []
 
         mailer = Mailer() if Mailer is not None else None
         total = len(self.employees)
+        # (result row, send args) for each payslip to mail once all PDFs exist
+        outgoing = []
 
         if getattr(self, 'email_store', None):
             try:
@@ -1279,7 +1297,7 @@ class DynamicPayrollProcessor:
                         except Exception:
                             pass
                 else:
-                    ok = self.generate_pdf_payslip(emp, outpath, withholding_placement)
+                    ok = self.generate_pdf_payslip(emp, outpath, withholding_placement, tmp_dir)
             except Exception as e:
                 ok = False
                 if callable(progress_cb):
@@ -1327,17 +1345,35 @@ class DynamicPayrollProcessor:
             else:
                 subject = (subject_tpl or "Payslip for {name}").format(name=emp.get('name', ''))
                 body = (body_tpl or "Please find attached your payslip.").format(name=emp.get('name', ''))
+                # Stays pending until the mailer reports back on this message
+                row = {"name": emp.get('name', ''), "seq": emp.get('seq', ''), "status": "pending", "error": None, "path": outpath, "email": to_email}
+                results.append(row)
+                outgoing.append((row, (to_email, subject, body, [outpath])))
+
+        def _on_sent(i, err):
+            row = outgoing[i][0]
+            if err is None:
+                row["status"] = "sent"
+                msg_line = f"[{i + 1}/{len(outgoing)}] Sent: {row['email']}"
+            else:
+                row["status"] = "error"
+                row["error"] = str(err)
+                msg_line = f"[{i + 1}/{len(outgoing)}] Failed: {row['email']}: {err}"
+            if callable(progress_cb):
                 try:
-                    mailer.send(to_email, subject, body, attachments=[os.path.abspath(outpath)])
-                    results.append({"name": emp.get('name', ''), "seq": emp.get('seq', ''), "status": "sent", "error": None, "path": outpath, "email": to_email})
-                except Exception as e:
-                    results.append({"name": emp.get('name', ''), "seq": emp.get('seq', ''), "status": "error", "error": str(e), "path": outpath, "email": to_email})
+                    progress_cb(msg_line)
+                except Exception:
+                    pass
+            else:
+                print(msg_line)
 
-            # throttle between sends
+        if outgoing:
+            # One mail session for the whole run; throttle_seconds spaces out the messages
             try:
-                time.sleep(float(throttle_seconds or 0))
+                rate_limit = float(throttle_seconds or 0)
             except Exception:
-                pass
+                rate_limit = 0.0
+            mailer.send_many((args for _, args in outgoing), rate_limit=rate_limit, on_result=_on_sent)
 
         if getattr(self, 'email_store', None):
             try:
@@ -1366,7 +1402,6 @@ class DynamicPayrollProcessor:
                 ws.col_breaks = PageBreak()
             else:
                 # fallback for older openpyxl (<=3.0.x)
-                from openpyxl.worksheet.pagebreak import RowBreaks, ColBreaks  # type: ignore
                 ws.row_breaks = RowBreaks()
                 ws.col_breaks = ColBreaks()
         except Exception:
@@ -1384,11 +1419,6 @@ class DynamicPayrollProcessor:
         ws.page_setup.orientation = 'landscape'
         ws.page_setup.paperSize   = 9   # A4 (use 11 for A5 if you prefer smaller paper)
 
-        from openpyxl.worksheet.page import PageMargins
-        ws.page_margins = PageMargins(
-            left=0.3, right=0.3, top=0.35, bottom=0.35, header=0.1, footer=0.1
-        )
-
         try:
             ws.page_margins = PageMargins(
                 left=0.2, right=0.2, top=0.25, bottom=0.25, header=0.1, footer=0.1
@@ -1412,16 +1442,18 @@ class DynamicPayrollProcessor:
         return None
 
     def _convert_with_soffice(self, soffice, xlsx_path, pdf_path):
-        """Convert using LibreOffice CLI (soffice). Returns True on success."""
+        """Convert using LibreOffice CLI (soffice). Returns True on success.
+
+        Expects absolute paths whose output folder already exists.
+        """
         try:
-            outdir = os.path.dirname(os.path.abspath(pdf_path)) or "."
-            os.makedirs(outdir, exist_ok=True)
+            outdir = os.path.dirname(pdf_path) or "."
             cmd = [soffice, "--headless", "--convert-to", "pdf", "--outdir", outdir, xlsx_path]
             subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             produced = os.path.join(outdir, os.path.splitext(os.path.basename(xlsx_path))[0] + ".pdf")
             if os.path.exists(produced):
                 # if produced name differs from desired, move/replace
-                if os.path.abspath(produced) != os.path.abspath(pdf_path):
+                if produced != pdf_path:
                     try:
                         os.replace(produced, pdf_path)
                     except Exception:
@@ -1437,34 +1469,42 @@ class DynamicPayrollProcessor:
         """
         Convert using Excel COM automation (Windows only). Returns True on success.
         Requires pywin32 (win32com). Opens Excel hidden, exports sheet as PDF, quits.
+        Expects absolute paths whose output folder already exists.
         """
         if platform.system() != 'Windows':
             print("[excel] Excel COM only available on Windows.")
             return False
 
-        try:
-            import pythoncom
-            import win32com.client as win32
-        except Exception as e:
-            print("[excel] pywin32 not available:", e)
+        if not HAS_WIN32_EXCEL:
+            print("[excel] pywin32 not available.")
             return False
 
-        xlsx_path = os.path.abspath(xlsx_path)
-        pdf_path = os.path.abspath(pdf_path)
-        outdir = os.path.dirname(pdf_path)
-        os.makedirs(outdir, exist_ok=True)
-
         excel = None
         wb = None
         try:
             pythoncom.CoInitialize()
             # Use DispatchEx to ensure a new Excel instance (avoids interfering with user Excel)
-            excel = win32.DispatchEx("Excel.Application")
+            excel = win32com.client.DispatchEx("Excel.Application")
             excel.Visible = False
             excel.DisplayAlerts = False
-
-            # Open workbook (not read-only to allow PrintArea to be set if requested)
-            wb = excel.Workbooks.Open(xlsx_path, ReadOnly=False)
+            excel.ScreenUpdating = False
+            excel.EnableEvents = False
+
+            # Read-only is enough: PrintArea changes stay in memory and we never save
+            wb = excel.Workbooks.Open(
+                xlsx_path,
+                UpdateLinks=0,
+                ReadOnly=True,
+                IgnoreReadOnlyRecommended=True,
+                AddToMru=False,
+            )
+            # Excel refuses Application.Calculation while no workbook is open.
+            # xlCalculationManual keeps the PrintArea edit below from triggering
+            # workbook recalculation; the export sheet is recalculated explicitly
+            try:
+                excel.Calculation = -4135
+            except Exception:
+                pass
 
             # Select sheet
             ws = None
@@ -1476,12 +1516,29 @@ class DynamicPayrollProcessor:
             if ws is None:
                 ws = wb.Worksheets(1)
 
-            # If a print area is provided, set it so Export uses the right bounds
+            # If a print area is provided, set it so Export uses the right bounds.
+            # PrintCommunication off batches the PageSetup write instead of a
+            # printer-driver round trip; it must be back on before exporting.
             if print_area:
+                try:
+                    excel.PrintCommunication = False
+                except Exception:
+                    pass
                 try:
                     ws.PageSetup.PrintArea = str(print_area)
                 except Exception as e:
                     print("[excel] failed to set PrintArea:", e)
+                finally:
+                    try:
+                        excel.PrintCommunication = True
+                    except Exception:
+                        pass
+
+            # openpyxl drops cached formula results, so recalc just this sheet
+            try:
+                ws.Calculate()
+            except Exception:
+                pass
 
             # Export to PDF. 0 = xlTypePDF
             xlTypePDF = 0
@@ -1495,9 +1552,8 @@ class DynamicPayrollProcessor:
                 OpenAfterPublish=False
             )
 
-            # small delay to ensure file is written
-            time.sleep(0.1)
-            return os.path.exists(pdf_path)
+            # ExportAsFixedFormat is synchronous; the PDF is complete once it returns
+            return os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0
         except Exception as e:
             print("[excel] Export failed:", e)
             return False
@@ -1521,7 +1577,8 @@ class DynamicPayrollProcessor:
     def _convert_xlsx_to_pdf(self, xlsx_path, pdf_path):
         """
         Unified converter: on Windows use Excel COM; on other OS try LibreOffice then Excel fallback.
-        Returns True on success.
+        Returns True on success. Paths are made absolute here once; the output
+        folder is expected to exist (callers create it before their loops).
         """
         xlsx_path = os.path.abspath(xlsx_path)
         pdf_path = os.path.abspath(pdf_path)
@@ -1548,12 +1605,9 @@ class DynamicPayrollProcessor:
                 return True
             print("[convert] soffice failed; trying Excel COM (pywin32) fallback if available.")
             # try excel if pywin32 is present (rare on non-Windows)
-            try:
-                import win32com.client  # type: ignore
-                ok2 = self._convert_with_excel(xlsx_path, pdf_path, sheet_name=getattr(self, 'template_sheet_name', None))
-                return ok2
-            except Exception:
-                return False
+            if HAS_WIN32_EXCEL:
+                return self._convert_with_excel(xlsx_path, pdf_path, sheet_name=getattr(self, 'template_sheet_name', None))
+            return False
 
         # Neither soffice nor excel available
         print("[convert] No PDF converter found (soffice or Excel COM).")
@@ -1564,7 +1618,7 @@ def main():
     processor = DynamicPayrollProcessor()
 
     # Check for CSV files
-    csv_files = [f for f in os.listdir('.') if f.endswith('.csv') and f != 'Template Payslip.csv']
+    csv_files = [f for f in glob.glob('*.csv') if f != 'Template Payslip.csv']
 
     if not csv_files:
         print("No CSV files found in current directory.")
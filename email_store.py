@@ -55,6 +55,36 @@ def _clean_email(value: Optional[str]) -> Optional[str]:
 class EmailStore:
     """Tiny helper around SQLite to remember employee email addresses."""
 
+    # Statement text is kept constant so sqlite3's per-connection statement
+    # cache can reuse the prepared statements within one connection, e.g.
+    # across every lookup of an apply_to_employees batch.
+    _SQL_LOOKUP_SEQ = "SELECT email FROM email_addresses WHERE seq = ? LIMIT 1"
+    _SQL_LOOKUP_ACCOUNT = "SELECT email FROM email_addresses WHERE account_no = ? LIMIT 1"
+    _SQL_LOOKUP_NAME = "SELECT email FROM email_addresses WHERE name_key = ? LIMIT 1"
+    _SQL_ID_BY_COLUMN = {
+        "seq": "SELECT id FROM email_addresses WHERE seq = ?",
+        "account_no": "SELECT id FROM email_addresses WHERE account_no = ?",
+        "name_key": "SELECT id FROM email_addresses WHERE name_key = ?",
+    }
+    _SQL_INSERT_KEYED = """
+        INSERT INTO email_addresses (seq, account_no, name_key, display_name, email)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_UNKEYED = """
+        INSERT INTO email_addresses (display_name, email)
+        VALUES (?, ?)
+    """
+    _SQL_UPDATE = """
+        UPDATE email_addresses
+        SET seq = COALESCE(?, seq),
+            account_no = COALESCE(?, account_no),
+            name_key = COALESCE(?, name_key),
+            display_name = COALESCE(?, display_name),
+            email = ?,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+
     def __init__(self, db_path: str):
         self.db_path = os.path.abspath(db_path)
         _ensure_parent_dir(self.db_path)
@@ -102,10 +132,15 @@ class EmailStore:
     # Public helpers
     # ------------------------------------------------------------------
     def import_from_csv(self, csv_path: str) -> None:
-        """Merge entries from a legacy emails.csv file into the store."""
+        """Merge entries from a legacy emails.csv file into the store.
+
+        All rows are staged inside a single transaction so a large file costs
+        one commit instead of one per row.
+        """
         csv_path = os.path.abspath(csv_path)
         if not os.path.exists(csv_path):
             return
+        rows = []
         with open(csv_path, "r", encoding="utf-8", newline="") as fh:
             reader = csv.DictReader(fh)
             for row in reader:
@@ -116,76 +151,73 @@ class EmailStore:
                 account_no = _clean(row.get("account_no"))
                 name = _clean_lower(row.get("name"))
                 display_name = _clean(row.get("name"))
-                self._upsert(seq=seq, account_no=account_no, name_key=name, display_name=display_name, email=email)
+                rows.append((seq, account_no, name, display_name, email))
+        if not rows:
+            return
+        with self._connect() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("BEGIN")
+                for seq, account_no, name_key, display_name, email in rows:
+                    self._upsert_row(cur, seq=seq, account_no=account_no, name_key=name_key, display_name=display_name, email=email)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
     def export_to_csv(self, csv_path: str) -> None:
         """Write all known email addresses to a CSV file (legacy compatibility)."""
         csv_path = os.path.abspath(csv_path)
         _ensure_parent_dir(csv_path)
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT seq, account_no, COALESCE(display_name, name_key) AS name, email
-                FROM email_addresses
-                ORDER BY last_updated DESC
-                """
-            )
-            rows = cur.fetchall()
         fieldnames = ["seq", "account_no", "name", "email"]
-        with open(csv_path, "w", encoding="utf-8", newline="") as fh:
-            writer = csv.DictWriter(fh, fieldnames=fieldnames)
-            writer.writeheader()
-            for seq, account, name, email in rows:
-                writer.writerow({
-                    "seq": seq or "",
-                    "account_no": account or "",
-                    "name": name or "",
-                    "email": email or "",
-                })
+        # Stream into a temporary file next to the target and swap it in only
+        # once every row is written, so a failed query leaves the old file intact.
+        tmp_path = csv_path + ".tmp"
+        try:
+            with self._connect() as conn, open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+                cur = conn.execute(
+                    """
+                    SELECT seq, account_no, COALESCE(display_name, name_key) AS name, email
+                    FROM email_addresses
+                    ORDER BY last_updated DESC
+                    """
+                )
+                writer = csv.writer(fh)
+                writer.writerow(fieldnames)
+                # Stream straight from the cursor instead of materialising every row
+                writer.writerows(
+                    (seq or "", account or "", name or "", email or "")
+                    for seq, account, name, email in cur
+                )
+            os.replace(tmp_path, csv_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
     def lookup(self, *, seq: Optional[str] = None, account_no: Optional[str] = None, name: Optional[str] = None) -> Optional[str]:
-        seq = _clean(seq)
-        account_no = _clean(account_no)
-        name_key = _clean_lower(name)
         with self._connect() as conn:
-            cur = conn.cursor()
-            if seq:
-                cur.execute("SELECT email FROM email_addresses WHERE seq = ? ORDER BY last_updated DESC LIMIT 1", (seq,))
-                row = cur.fetchone()
-                if row:
-                    email = row[0]
-                    if email and email.lower() not in PLACEHOLDER_EMAILS:
-                        return email
-            if account_no:
-                cur.execute("SELECT email FROM email_addresses WHERE account_no = ? ORDER BY last_updated DESC LIMIT 1", (account_no,))
-                row = cur.fetchone()
-                if row:
-                    email = row[0]
-                    if email and email.lower() not in PLACEHOLDER_EMAILS:
-                        return email
-            if name_key:
-                cur.execute("SELECT email FROM email_addresses WHERE name_key = ? ORDER BY last_updated DESC LIMIT 1", (name_key,))
-                row = cur.fetchone()
-                if row:
-                    email = row[0]
-                    if email and email.lower() not in PLACEHOLDER_EMAILS:
-                        return email
-        return None
+            return self._lookup_with(conn, seq=seq, account_no=account_no, name=name)
 
     def apply_to_employees(self, employees: Iterable[Dict]) -> None:
-        for emp in employees:
-            if not isinstance(emp, dict):
-                continue
-            if _clean_email(emp.get("email")):
-                continue
-            email = self.lookup(
-                seq=emp.get("seq"),
-                account_no=emp.get("account_no"),
-                name=emp.get("name"),
-            )
-            if email:
-                emp["email"] = email
+        # One connection for the whole batch so the cached lookup statements
+        # are prepared once instead of once per employee.
+        with self._connect() as conn:
+            for emp in employees:
+                if not isinstance(emp, dict):
+                    continue
+                if _clean_email(emp.get("email")):
+                    continue
+                email = self._lookup_with(
+                    conn,
+                    seq=emp.get("seq"),
+                    account_no=emp.get("account_no"),
+                    name=emp.get("name"),
+                )
+                if email:
+                    emp["email"] = email
 
     def remember_from_employee(self, employee: Dict, email: Optional[str]) -> None:
         clean_email = _clean_email(email)
@@ -200,55 +232,48 @@ class EmailStore:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _lookup_with(self, conn: sqlite3.Connection, *, seq: Optional[str], account_no: Optional[str], name: Optional[str]) -> Optional[str]:
+        for sql, value in (
+            (self._SQL_LOOKUP_SEQ, _clean(seq)),
+            (self._SQL_LOOKUP_ACCOUNT, _clean(account_no)),
+            (self._SQL_LOOKUP_NAME, _clean_lower(name)),
+        ):
+            if not value:
+                continue
+            row = conn.execute(sql, (value,)).fetchone()
+            if row:
+                email = row[0]
+                if email and email.lower() not in PLACEHOLDER_EMAILS:
+                    return email
+        return None
+
     def _upsert(self, *, seq: Optional[str], account_no: Optional[str], name_key: Optional[str], display_name: Optional[str], email: str) -> None:
         if not email:
             return
         with self._connect() as conn:
-            cur = conn.cursor()
-            record_id: Optional[int] = None
-            for column, value in (("seq", seq), ("account_no", account_no), ("name_key", name_key)):
-                if not value:
-                    continue
-                cur.execute(f"SELECT id FROM email_addresses WHERE {column} = ?", (value,))
-                row = cur.fetchone()
-                if row:
-                    record_id = int(row[0])
-                    break
+            self._upsert_row(conn.cursor(), seq=seq, account_no=account_no, name_key=name_key, display_name=display_name, email=email)
+            conn.commit()
 
-            if record_id is None and (seq or account_no or name_key):
-                cur.execute(
-                    """
-                    INSERT INTO email_addresses (seq, account_no, name_key, display_name, email)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (seq, account_no, name_key, display_name, email),
-                )
-                record_id = cur.lastrowid
+    def _upsert_row(self, cur: sqlite3.Cursor, *, seq: Optional[str], account_no: Optional[str], name_key: Optional[str], display_name: Optional[str], email: str) -> None:
+        """Insert or update a single entry using ``cur``; the caller commits."""
+        record_id: Optional[int] = None
+        for column, value in (("seq", seq), ("account_no", account_no), ("name_key", name_key)):
+            if not value:
+                continue
+            row = cur.execute(self._SQL_ID_BY_COLUMN[column], (value,)).fetchone()
+            if row:
+                record_id = int(row[0])
+                break
 
-            if record_id is None:
-                cur.execute(
-                    """
-                    INSERT INTO email_addresses (display_name, email)
-                    VALUES (?, ?)
-                    """,
-                    (display_name or email, email),
-                )
-                record_id = cur.lastrowid
+        if record_id is None and (seq or account_no or name_key):
+            cur.execute(self._SQL_INSERT_KEYED, (seq, account_no, name_key, display_name, email))
+            record_id = cur.lastrowid
 
-            cur.execute(
-                """
-                UPDATE email_addresses
-                SET seq = COALESCE(?, seq),
-                    account_no = COALESCE(?, account_no),
-                    name_key = COALESCE(?, name_key),
-                    display_name = COALESCE(?, display_name),
-                    email = ?,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """,
-                (seq, account_no, name_key, display_name, email, record_id),
-            )
-            conn.commit()
+        if record_id is None:
+            cur.execute(self._SQL_INSERT_UNKEYED, (display_name or email, email))
+            record_id = cur.lastrowid
+
+        cur.execute(self._SQL_UPDATE, (seq, account_no, name_key, display_name, email, record_id))
 
     def count(self) -> int:
         with self._connect() as conn:
@@ -258,14 +283,12 @@ class EmailStore:
             return int(row[0] or 0) if row else 0
 
     def to_dict(self) -> Dict[str, str]:
-        data: Dict[str, str] = {}
         with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT seq, email FROM email_addresses WHERE seq IS NOT NULL AND seq != ''")
-            for seq, email in cur.fetchall():
-                if seq and email:
-                    data[str(seq)] = email
-        return data
+            return {
+                str(seq): email
+                for seq, email in conn.execute("SELECT seq, email FROM email_addresses WHERE seq IS NOT NULL AND seq != ''")
+                if seq and email
+            }
 
 
 __all__ = ["EmailStore"]
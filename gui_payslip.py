@@ -2,11 +2,77 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import csv
 import os
-from datetime import datetime
 import sys
+import codecs
+import locale
+import threading
+import multiprocessing
+import queue
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+# Optional: polars parses CSV with a multi-threaded native reader; used ahead of pyarrow when installed.
+HAS_POLARS = False
+try:
+    import polars as pl
+    HAS_POLARS = True
+except Exception:
+    pl = None
 
 # Import our existing classes
-from main import Employee, Payslip, load_employees_from_csv, generate_payslips_from_csv
+from main import (Employee, Payslip, load_employees_from_csv, generate_payslips_from_csv, pay_dates,
+                  iter_csv_rows, EMPLOYEE_CSV_COLUMNS, PARALLEL_MIN_ROWS)
+# Rows parsed per chunk before they are handed to the treeview
+CSV_CHUNK_ROWS = 5000
+
+
+# Pending payslips the writer thread may fall behind by
+WRITE_QUEUE_SIZE = 64
+
+# Sample file written by "Create Template"
+EMPLOYEE_TEMPLATE_CSV = b"""Employee Name,Employee ID,Hourly Rate,Hours Worked,Department,Position,Tax Exempt,Insurance Plan,Notes
+John Doe,EMP001,25.00,40.0,Engineering,Software Developer,No,Standard,
+Jane Smith,EMP002,22.50,38.5,Marketing,Marketing Manager,No,Premium,
+Bob Johnson,EMP003,20.00,45.0,Sales,Sales Representative,No,Basic,Overtime eligible
+Alice Brown,EMP004,28.00,42.0,HR,HR Specialist,Yes,Standard,
+Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
+
+
+def render_payslip(employee, path_prefix, dates):
+    """Calculate one employee's payslip; returns (path, text) for the writer.
+
+    path_prefix is os.path.join(output_dir, 'payslip_'), built once per run.
+    Kept at module level so ProcessPoolExecutor can send it to worker processes.
+    """
+    payslip = Payslip(employee, dates=dates)
+    payslip.calculate_deductions()
+    payslip.calculate_net_pay()
+
+    filepath = f"{path_prefix}{employee.employee_id}_{payslip.file_stamp}.txt"
+    return filepath, payslip.generate_payslip()
+
+
+def _payslip_writer(write_queue, errors):
+    """Writer thread: drain (path, text) items until the None sentinel.
+
+    After a failure it keeps draining (without writing) so producers never
+    block on a full queue; the first error is left in `errors`.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        if errors:
+            continue
+        path, text = item
+        try:
+            # Same bytes as main.stream_payslips: UTF-8, '\n' line endings
+            with open(path, 'wb', buffering=1 << 16) as f:
+                f.write(text.encode('utf-8'))
+        except Exception as e:
+            errors.append(e)
+
 
 class PayslipGeneratorGUI:
     def __init__(self, root):
@@ -78,12 +144,22 @@ class PayslipGeneratorGUI:
             self.employee_tree.heading(col, text=col)
             self.employee_tree.column(col, width=100)
 
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
-        self.employee_tree.configure(yscrollcommand=scrollbar.set)
+        # Add scrollbar. The tree only holds the rows currently in view, so the
+        # scrollbar drives _render_viewport over self.employees instead of yview
+        self.v_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.v_scrollbar.set(0.0, 1.0)
 
         self.employee_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.employee_tree.bind(sequence, self._on_mousewheel)
+        self.employee_tree.bind('<Configure>', self._on_tree_resize)
+        # Keyboard navigation has to page through self.employees too, not
+        # just the rows that happen to be in the tree
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.employee_tree.bind(sequence, self._on_key_nav)
+        self.employee_tree.bind('<<TreeviewSelect>>', self._on_tree_select)
 
         # Status bar
         self.status_var = tk.StringVar()
@@ -91,9 +167,19 @@ class PayslipGeneratorGUI:
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
 
+        # Progress bar, only shown while payslips are being generated
+        self.progress = ttk.Progressbar(main_frame, mode='determinate')
+        self.progress.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.progress.grid_remove()
+
         # Initialize variables
         self.employees = []
+        self._payslip_cache = {}
         self.current_file = None
+        self._view_first = 0
+        self._view_rows = 0
+        # index into self.employees of the selected row, kept even while it is scrolled out of view
+        self._selected_index = None
 
         # Bind double-click event
         self.employee_tree.bind('<Double-1>', self.show_employee_payslip)
@@ -124,54 +210,245 @@ class PayslipGeneratorGUI:
 
         try:
             # Clear existing data
-            for item in self.employee_tree.get_children():
-                self.employee_tree.delete(item)
+            self.employees = []
+            self._payslip_cache.clear()
+            self._selected_index = None
+            self._render_viewport(0)
 
             # Load data based on file type
             if self.current_file.endswith('.csv'):
-                self.employees = self.load_csv_data(self.current_file)
+                # Parse on a worker thread so the window stays responsive;
+                # rows are handed back to the Tk thread one chunk at a time
+                self._set_busy(True)
+                self.status_var.set(f"Loading {os.path.basename(self.current_file)}...")
+                threading.Thread(target=self._load_csv_worker, args=(self.current_file,), daemon=True).start()
+                return
             elif self.current_file.endswith('.xlsx'):
-                self.employees = self.load_excel_data(self.current_file)
+                employees = self.load_excel_data(self.current_file)
             else:
                 messagebox.showerror("Error", "Unsupported file format")
                 return
 
-            # Populate treeview
-            for employee in self.employees:
-                self.employee_tree.insert('', tk.END, values=(
-                    employee.name,
-                    employee.employee_id,
-                    f"${employee.hourly_rate:.2f}",
-                    f"{employee.hours_worked:.1f}",
-                    employee.department,
-                    employee.position
-                ))
-
+            self._insert_chunk(employees)
             self.status_var.set(f"Loaded {len(self.employees)} employees")
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
 
+    def _set_busy(self, busy):
+        """Disable the load/generate buttons while a background job runs"""
+        state = ['disabled'] if busy else ['!disabled']
+        self.load_button.state(state)
+        self.generate_button.state(state)
+
+    def _load_csv_worker(self, filename):
+        """Worker thread: parse the CSV and post each chunk to the Tk thread"""
+        try:
+            for chunk in self.iter_csv_chunks(filename):
+                self.root.after(0, self._insert_chunk, chunk)
+        except Exception as e:
+            self.root.after(0, self._finish_csv_load, str(e))
+        else:
+            self.root.after(0, self._finish_csv_load, None)
+
+    def _insert_chunk(self, employees):
+        """Append a chunk of employees to the model and refresh the view"""
+        self.employees.extend(employees)
+        self._render_viewport()
+        self.status_var.set(f"Loading... {len(self.employees)} employees")
+
+    def _visible_rows(self):
+        """Number of rows that fit in the treeview at its current size"""
+        tree = self.employee_tree
+        height = tree.winfo_height()
+        if height <= 1:
+            # not mapped yet; fall back to the requested height in rows
+            return int(tree.cget('height'))
+        rowheight = ttk.Style().lookup('Treeview', 'rowheight')
+        try:
+            rowheight = int(rowheight)
+        except (TypeError, ValueError):
+            rowheight = 20
+        # one row's worth of space goes to the headings
+        return max(1, height // rowheight - 1)
+
+    def _render_viewport(self, first=None):
+        """Show only the employees from `first` that fit in the treeview"""
+        total = len(self.employees)
+        window = self._visible_rows()
+        self._view_rows = window
+        if first is None:
+            first = self._view_first
+        first = max(0, min(int(first), total - window))
+        self._view_first = first
+
+        # Format every row up front; '%' is cheaper than an f-string for a lone float
+        rows = [
+            (e.name, e.employee_id, '$%.2f' % e.hourly_rate, '%.1f' % e.hours_worked, e.department, e.position)
+            for e in self.employees[first:first + window]
+        ]
+        tree = self.employee_tree
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        # item ids are indexes into self.employees
+        insert = tree.insert
+        for index, values in enumerate(rows, first):
+            insert('', tk.END, iid=str(index), values=values)
+        selected = self._selected_index
+        if selected is not None and first <= selected < first + window:
+            tree.selection_set(str(selected))
+            tree.focus(str(selected))
+
+        if total:
+            self.v_scrollbar.set(first / total, min(1.0, (first + window) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+
+    def _on_tree_resize(self, event):
+        """Re-render only when the number of rows that fit has changed"""
+        if self._visible_rows() != self._view_rows:
+            self._render_viewport()
+
+    def _on_scrollbar(self, *args):
+        """Scrollbar command: translate moveto/scroll into a new first row"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            first = float(args[1]) * len(self.employees)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self._visible_rows()
+            first = self._view_first + step
+        else:
+            return
+        self._render_viewport(first)
+
+    def _on_mousewheel(self, event):
+        """Scroll the virtual view three rows per wheel notch"""
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            step = -3
+        else:
+            step = 3
+        self._render_viewport(self._view_first + step)
+        return 'break'
+
+    def _on_tree_select(self, event):
+        """Remember the clicked row in the model so it survives scrolling"""
+        selection = self.employee_tree.selection()
+        # an empty selection only means the row scrolled out of the tree
+        if selection:
+            self._selected_index = int(selection[0])
+
+    def _on_key_nav(self, event):
+        """Up/Down, PageUp/PageDown and Home/End over all employees, scrolling as needed"""
+        total = len(self.employees)
+        if not total:
+            return 'break'
+        window = self._visible_rows()
+        current = self._selected_index
+        if current is None:
+            current = self._view_first
+        key = event.keysym
+        if key == 'Up':
+            index = current - 1
+        elif key == 'Down':
+            index = current + 1
+        elif key == 'Prior':
+            index = current - window
+        elif key == 'Next':
+            index = current + window
+        elif key == 'Home':
+            index = 0
+        else:
+            index = total - 1
+        index = max(0, min(index, total - 1))
+        self._selected_index = index
+
+        first = self._view_first
+        if index < first:
+            first = index
+        elif index >= first + window:
+            first = index - window + 1
+        self._render_viewport(first)
+        return 'break'
+
+    def _finish_csv_load(self, error):
+        """Runs on the Tk thread once the worker is done"""
+        self._set_busy(False)
+        if error:
+            # Don't leave a partially loaded file behind
+            self.employees = []
+            self._payslip_cache.clear()
+            self._selected_index = None
+            self._render_viewport(0)
+            self.status_var.set("Ready")
+            messagebox.showerror("Error", f"Failed to load data: {error}")
+            return
+        self.status_var.set(f"Loaded {len(self.employees)} employees")
+
     def load_csv_data(self, filename):
         """Load data from CSV file"""
-        employees = []
+        return [employee for chunk in self.iter_csv_chunks(filename) for employee in chunk]
+
+    def iter_csv_chunks(self, filename, chunk_size=CSV_CHUNK_ROWS):
+        """Yield lists of Employee objects parsed from a CSV file"""
         try:
-            with open(filename, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                for row in csv_reader:
-                    employee = Employee(
-                        name=row['Employee Name'],
-                        employee_id=row['Employee ID'],
-                        hourly_rate=row['Hourly Rate'],
-                        hours_worked=row['Hours Worked'],
-                        department=row.get('Department', ''),
-                        position=row.get('Position', '')
-                    )
-                    employees.append(employee)
+            # polars only decodes UTF-8; under any other platform encoding
+            # (cp1252 on Windows) the file is read as open() would read it
+            if HAS_POLARS and codecs.lookup(locale.getpreferredencoding(False)).name == 'utf-8':
+                df = self._read_csv_polars(filename)
+                if df is not None:
+                    # The frame stays columnar; Employee objects are only created per chunk
+                    for offset in range(0, df.height, chunk_size):
+                        yield [Employee(*row) for row in df.slice(offset, chunk_size).iter_rows()]
+                    return
+            # Same reader as the command-line generator (pyarrow when installed)
+            rows = iter_csv_rows(filename)
+            make_employee = Employee
+            for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+                yield [make_employee(*row) for row in chunk]
         except Exception as e:
             raise Exception(f"CSV loading error: {str(e)}")
 
-        return employees
+    def _read_csv_header(self, filename):
+        """Return the CSV header row, checking the required employee columns are there"""
+        with open(filename, 'r', newline='') as file:
+            header = next(csv.reader(file), [])
+        for column_name in EMPLOYEE_CSV_COLUMNS[:4]:
+            if column_name not in header:
+                raise KeyError(column_name)
+        return header
+
+    def _read_csv_polars(self, filename):
+        """
+        Parse the CSV with polars into a frame in Employee argument order, or
+        return None if polars rejects a file the csv module can read (padded
+        numbers such as ' 25.00 ', 1_000, CR-only line endings)
+        """
+        header = self._read_csv_header(filename)
+        columns = [c for c in EMPLOYEE_CSV_COLUMNS if c in header]
+        # Text columns stay strings so IDs such as 007 keep their leading zeros
+        types = {c: pl.Utf8 for c in columns}
+        types['Hourly Rate'] = pl.Float64
+        types['Hours Worked'] = pl.Float64
+        # Rows longer than the header are cut short, as the csv reader does;
+        # short rows get nulls, filled in below
+        try:
+            try:
+                df = pl.read_csv(filename, columns=columns, schema_overrides=types, truncate_ragged_lines=True)
+            except TypeError:
+                # polars before 0.20.31 calls this argument dtypes
+                df = pl.read_csv(filename, columns=columns, dtypes=types, truncate_ragged_lines=True)
+        except pl.exceptions.PolarsError:
+            return None
+        # Blank lines come back as all-null rows; the csv reader skips them
+        df = df.filter(~pl.all_horizontal(pl.all().is_null()))
+        return df.with_columns(
+            [pl.col(pl.Utf8).fill_null('')]
+            + [pl.lit('').alias(c) for c in EMPLOYEE_CSV_COLUMNS if c not in columns]
+        ).select(list(EMPLOYEE_CSV_COLUMNS))
 
     def load_excel_data(self, filename):
         """Load data from Excel file (placeholder for future implementation)"""
@@ -193,39 +470,85 @@ class PayslipGeneratorGUI:
         if not output_dir:
             return
 
+        # Run the generation on a worker thread; it reports back through a
+        # queue that the Tk thread polls, so the window stays responsive
+        self._set_busy(True)
+        self.status_var.set("Generating payslips...")
+        self.progress.configure(maximum=len(self.employees), value=0)
+        self.progress.grid()
+        self._gen_events = queue.SimpleQueue()
+        threading.Thread(target=self._generate_worker,
+                         args=(output_dir, list(self.employees), self._gen_events),
+                         daemon=True).start()
+        self.root.after(100, self._poll_generation, output_dir)
+
+    def _generate_worker(self, output_dir, employees, events):
+        """Worker thread: render and write every payslip, posting progress to `events`"""
         try:
-            # Generate payslips
+            # Each payslip is independent, so large rosters are rendered in
+            # worker processes while a single thread does the writing
+            # One set of dates and one path prefix for the whole run
+            dates = pay_dates()
+            path_prefix = os.path.join(output_dir, 'payslip_')
+            write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+            write_errors = []
+            writer = threading.Thread(target=_payslip_writer, args=(write_queue, write_errors), daemon=True)
+            writer.start()
+            executor = None
             generated_count = 0
-            for employee in self.employees:
-                payslip = Payslip(employee)
-                payslip.calculate_deductions()
-                payslip.calculate_net_pay()
-
-                # Save payslip
-                filename = f"payslip_{employee.employee_id}_{datetime.now().strftime('%Y%m%d')}.txt"
-                filepath = os.path.join(output_dir, filename)
-
-                with open(filepath, 'w') as f:
-                    f.write(payslip.generate_payslip())
-
-                generated_count += 1
-
-            messagebox.showinfo("Success",
-                              f"Generated {generated_count} payslips in:\n{output_dir}")
-            self.status_var.set(f"Generated {generated_count} payslips")
-
+            try:
+                if len(employees) >= PARALLEL_MIN_ROWS:
+                    executor = ProcessPoolExecutor()
+                    rendered = executor.map(render_payslip, employees,
+                                            repeat(path_prefix), repeat(dates), chunksize=32)
+                else:
+                    rendered = map(render_payslip, employees, repeat(path_prefix), repeat(dates))
+                for item in rendered:
+                    write_queue.put(item)
+                    generated_count += 1
+                    events.put(('progress', generated_count))
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                write_queue.put(None)
+                writer.join()
+            if write_errors:
+                raise write_errors[0]
+            events.put(('done', generated_count))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate payslips: {str(e)}")
+            events.put(('error', e))
+
+    def _poll_generation(self, output_dir):
+        """Tk thread: apply queued progress and finish once the worker is done"""
+        progress = None
+        while True:
+            try:
+                kind, payload = self._gen_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                progress = payload
+            else:
+                self._finish_generation(output_dir, kind, payload)
+                return
+        if progress is not None:
+            self.progress.configure(value=progress)
+            self.status_var.set(f"Generating payslips... {progress}/{len(self.employees)}")
+        self.root.after(100, self._poll_generation, output_dir)
+
+    def _finish_generation(self, output_dir, kind, payload):
+        self.progress.grid_remove()
+        self._set_busy(False)
+        if kind == 'error':
+            self.status_var.set("Ready")
+            messagebox.showerror("Error", f"Failed to generate payslips: {str(payload)}")
+            return
+        messagebox.showinfo("Success",
+                          f"Generated {payload} payslips in:\n{output_dir}")
+        self.status_var.set(f"Generated {payload} payslips")
 
     def create_template(self):
         """Create a template file for user to fill"""
-        template_content = """Employee Name,Employee ID,Hourly Rate,Hours Worked,Department,Position,Tax Exempt,Insurance Plan,Notes
-John Doe,EMP001,25.00,40.0,Engineering,Software Developer,No,Standard,
-Jane Smith,EMP002,22.50,38.5,Marketing,Marketing Manager,No,Premium,
-Bob Johnson,EMP003,20.00,45.0,Sales,Sales Representative,No,Basic,Overtime eligible
-Alice Brown,EMP004,28.00,42.0,HR,HR Specialist,Yes,Standard,
-Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
-
         # Ask where to save template
         filename = filedialog.asksaveasfilename(
             title="Save Template As",
@@ -236,15 +559,17 @@ Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
 
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    f.write(template_content)
+                Path(filename).write_bytes(EMPLOYEE_TEMPLATE_CSV)
 
                 messagebox.showinfo("Template Created",
                                   f"Template saved as:\n{filename}\n\n"
                                   "You can open this file in Excel or any spreadsheet application.")
 
-                # Open the template in default application
-                os.startfile(filename)
+                # Open the template in default application (Windows only). The
+                # shell call can stall while the handler starts, so keep it off
+                # the Tk thread
+                if hasattr(os, 'startfile'):
+                    threading.Thread(target=os.startfile, args=(filename,), daemon=True).start()
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to create template: {str(e)}")
@@ -253,15 +578,10 @@ Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
         """Show payslip for double-clicked employee"""
         selection = self.employee_tree.selection()
         if selection:
-            item = self.employee_tree.item(selection[0])
-            employee_id = item['values'][1]
-
-            # Find employee
-            employee = next((emp for emp in self.employees if emp.employee_id == employee_id), None)
+            # Row iids are indices into self.employees (see _render_viewport)
+            employee = self.employees[int(selection[0])]
             if employee:
-                payslip = Payslip(employee)
-                payslip.calculate_deductions()
-                payslip.calculate_net_pay()
+                payslip, payslip_text = self._payslip_for(int(selection[0]))
 
                 # Create popup window
                 popup = tk.Toplevel(self.root)
@@ -270,7 +590,7 @@ Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
 
                 # Text widget for payslip
                 text_widget = tk.Text(popup, wrap=tk.WORD, padx=10, pady=10)
-                text_widget.insert(tk.END, payslip.generate_payslip())
+                text_widget.insert(tk.END, payslip_text)
                 text_widget.config(state=tk.DISABLED)
 
                 scrollbar = ttk.Scrollbar(popup, orient=tk.VERTICAL, command=text_widget.yview)
@@ -281,10 +601,20 @@ Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
 
                 # Save button
                 save_button = ttk.Button(popup, text="Save Payslip",
-                                       command=lambda: self.save_individual_payslip(payslip, popup))
+                                       command=lambda: self.save_individual_payslip(payslip, popup, payslip_text))
                 save_button.pack(pady=10)
 
-    def save_individual_payslip(self, payslip, parent_window):
+    def _payslip_for(self, index):
+        """Return (payslip, text) for self.employees[index], computed once per load"""
+        cached = self._payslip_cache.get(index)
+        if cached is None:
+            payslip = Payslip(self.employees[index])
+            payslip.calculate_deductions()
+            payslip.calculate_net_pay()
+            cached = self._payslip_cache[index] = (payslip, payslip.generate_payslip())
+        return cached
+
+    def save_individual_payslip(self, payslip, parent_window, payslip_text=None):
         """Save individual payslip"""
         filename = filedialog.asksaveasfilename(
             title="Save Payslip As",
@@ -295,13 +625,15 @@ Charlie Wilson,EMP005,18.50,37.0,Finance,Accountant,No,Basic,"""
 
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    f.write(payslip.generate_payslip())
+                # Same bytes as the generated payslips: UTF-8, '\n' line endings
+                payslip.save_to_file(filename, text=payslip_text)
                 messagebox.showinfo("Saved", f"Payslip saved as:\n{filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save: {str(e)}")
 
 def main():
+    # needed for ProcessPoolExecutor when run as a frozen Windows executable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = PayslipGeneratorGUI(root)
     root.mainloop()
@@ -1,12 +1,22 @@
 # mailer.py
-import os, mimetypes, platform, ssl, smtplib, base64
+import os, mimetypes, platform, ssl, smtplib, base64, time, functools, threading
 from email.message import EmailMessage
 import json
 import requests
+from requests.adapters import HTTPAdapter
 try:
     import msal
 except Exception:
     msal = None
+try:
+    import orjson
+except Exception:
+    orjson = None
+try:
+    # SIMD base64 encoder; same API as the stdlib module
+    import pybase64 as _b64
+except Exception:
+    _b64 = base64
 
 # Load .env
 try:
@@ -22,6 +32,74 @@ except Exception:
                 if not line or line.startswith("#") or "=" not in line: continue
                 k,v = line.split("=",1); os.environ.setdefault(k.strip(), v.strip())
 
+GRAPH_API = "https://graph.microsoft.com/v1.0"
+# Graph only accepts inline fileAttachments up to ~3 MB; larger files need an upload session
+GRAPH_INLINE_ATTACHMENT_LIMIT = 3 * 1024 * 1024
+# upload session chunks must be a multiple of 320 KiB
+GRAPH_UPLOAD_CHUNK = 10 * 320 * 1024
+# base64 input chunk; a multiple of 3 so encoded chunks concatenate without padding
+B64_READ_CHUNK = 57 * 1024
+
+def _json_bytes(obj):
+    # orjson serialises straight to UTF-8 bytes in C; the stdlib is the fallback
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+@functools.lru_cache(maxsize=256)
+def _guess_mime(path):
+    """(maintype, subtype) for an attachment path, defaulting to octet-stream."""
+    ctype, _ = mimetypes.guess_type(path)
+    if not ctype:
+        ctype = "application/octet-stream"
+    maintype, subtype = ctype.split("/", 1)
+    return maintype, subtype
+
+@functools.lru_cache(maxsize=32)
+def _read_file_cached(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _read_attachment(path):
+    # Keyed on mtime/size so a file rewritten between sends is read again;
+    # shared attachments (e.g. a common letter) are only read once per run
+    st = os.stat(path)
+    return _read_file_cached(path, st.st_mtime_ns, st.st_size)
+
+def _b64_file(path, out):
+    """Append the base64 of a file to `out`, encoded chunk by chunk so the raw bytes are never held whole."""
+    with open(path, "rb", buffering=1 << 16) as f:
+        while True:
+            chunk = f.read(B64_READ_CHUNK)
+            if not chunk:
+                break
+            out += _b64.b64encode(chunk)
+
+def _write_graph_message(out, message, attachments):
+    """
+    Append a Graph message as JSON to the bytearray `out`, with `attachments`
+    as inline fileAttachments. Their base64 goes straight into the buffer
+    instead of through a str and the JSON encoder (it never needs escaping).
+    """
+    head = _json_bytes(message)
+    if not attachments:
+        out += head
+        return
+    out += memoryview(head)[:-1]
+    out += b',"attachments":['
+    for i, path in enumerate(attachments):
+        maintype, subtype = _guess_mime(path)
+        if i:
+            out += b','
+        out += b'{"@odata.type":"#microsoft.graph.fileAttachment","name":'
+        out += _json_bytes(os.path.basename(path))
+        out += b',"contentType":'
+        out += _json_bytes(f"{maintype}/{subtype}")
+        out += b',"contentBytes":"'
+        _b64_file(path, out)
+        out += b'"}'
+    out += b']}'
+
 def _bool_env(name, default=False):
     v = (os.getenv(name) or "").strip().lower()
     if v in ("1","true","yes","y","on"): return True
@@ -66,6 +144,17 @@ class Mailer:
         # scopes: for client credentials use /.default, for delegated flows use Mail.Send
         self.graph_scope = os.getenv("GRAPH_SCOPE") or "https://graph.microsoft.com/.default"
 
+        # Reused across sends: one keep-alive HTTP pool, one MSAL app (and its token cache)
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        self._msal_app = None
+        self._token = None
+        self._token_exp = 0.0
+        # Outlook COM connection, created on first send (see _outlook_app)
+        self._outlook = None
+        self._outlook_accounts = {}
+        self._outlook_thread = None
+
         # sane defaults
         if not self.from_email:
             self.from_email = self.user
@@ -81,27 +170,83 @@ class Mailer:
         else:
             return self._send_smtp(to_email, subject, body_text, attachments or [], body_html, cc or [])
 
+    def send_many(self, messages, rate_limit=0.0, on_result=None):
+        """
+        Send a run of messages, reusing one SMTP login for all of them.
+        Each item is a (to_email, subject, body_text[, attachments[, body_html[, cc]]]) tuple;
+        messages may be a generator, so callers can build each one just before it is sent.
+        rate_limit is the pause in seconds between messages, for provider throttling.
+        on_result, if given, is called as on_result(index, error) right after each message.
+        Returns one entry per message: None if it was sent, else the exception raised.
+        """
+        results = []
+        srv = None
+        try:
+            for i, item in enumerate(messages):
+                if i and rate_limit:
+                    time.sleep(rate_limit)
+                to_email, subject, body_text, attachments, body_html, cc = (tuple(item) + (None,) * 3)[:6]
+                try:
+                    if self.backend in ("outlook", "graph"):
+                        # Graph already reuses the HTTP session and token, Outlook its COM connection
+                        self.send(to_email, subject, body_text, attachments, body_html, cc)
+                    else:
+                        msg, recipients = self._build_smtp_message(to_email, subject, body_text, attachments or [], body_html, cc or [])
+                        if srv is None:
+                            srv = self._connect_smtp()
+                        try:
+                            srv.send_message(msg, from_addr=self.from_email, to_addrs=recipients)
+                        except smtplib.SMTPServerDisconnected:
+                            # Server dropped the session mid-run; log in again once
+                            srv = None
+                            srv = self._connect_smtp()
+                            srv.send_message(msg, from_addr=self.from_email, to_addrs=recipients)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+                if on_result is not None:
+                    on_result(i, results[-1])
+        finally:
+            if srv is not None:
+                try:
+                    srv.quit()
+                except Exception:
+                    pass
+        return results
+
     # ---------- Microsoft Graph backend ----------
     def _acquire_graph_token(self):
+        # Reuse the last token until a minute before it expires
+        if self._token and time.time() < self._token_exp - 60:
+            return self._token
         if not msal:
             raise RuntimeError("msal library not installed; add 'msal' to requirements.txt")
         # Prefer client credentials flow when client secret present
         if self.graph_client_id and self.graph_client_secret and self.graph_tenant:
-            app = msal.ConfidentialClientApplication(
-                client_id=self.graph_client_id,
-                client_credential=self.graph_client_secret,
-                authority=f'https://login.microsoftonline.com/{self.graph_tenant}'
-            )
+            if self._msal_app is None:
+                self._msal_app = msal.ConfidentialClientApplication(
+                    client_id=self.graph_client_id,
+                    client_credential=self.graph_client_secret,
+                    authority=f'https://login.microsoftonline.com/{self.graph_tenant}'
+                )
+            app = self._msal_app
             scopes = [self.graph_scope] if self.graph_scope else ["https://graph.microsoft.com/.default"]
             token = app.acquire_token_silent(scopes, account=None)
             if not token:
                 token = app.acquire_token_for_client(scopes=scopes)
             if not token or 'access_token' not in token:
                 raise RuntimeError(f"Failed to acquire Graph token: {token}")
-            return token['access_token']
+            return self._remember_token(token)
         # Fallback to device code flow (interactive)
         if self.graph_client_id:
-            app = msal.PublicClientApplication(client_id=self.graph_client_id, authority=f'https://login.microsoftonline.com/{self.graph_tenant or "common"}')
+            if self._msal_app is None:
+                self._msal_app = msal.PublicClientApplication(client_id=self.graph_client_id, authority=f'https://login.microsoftonline.com/{self.graph_tenant or "common"}')
+            app = self._msal_app
+            # Refresh silently if this app already signed someone in
+            accounts = app.get_accounts()
+            token = app.acquire_token_silent(["Mail.Send"], account=accounts[0]) if accounts else None
+            if token and 'access_token' in token:
+                return self._remember_token(token)
             flow = app.initiate_device_flow(scopes=["Mail.Send"])
             if 'user_code' not in flow:
                 raise RuntimeError('Failed to start device code flow')
@@ -109,9 +254,14 @@ class Mailer:
             token = app.acquire_token_by_device_flow(flow)
             if not token or 'access_token' not in token:
                 raise RuntimeError(f"Failed to acquire token via device flow: {token}")
-            return token['access_token']
+            return self._remember_token(token)
         raise RuntimeError('Graph configuration missing. Set GRAPH_CLIENT_ID (+ client secret) in environment')
 
+    def _remember_token(self, token):
+        self._token = token['access_token']
+        self._token_exp = time.time() + float(token.get('expires_in') or 0)
+        return self._token
+
     def _send_graph(self, to_email, subject, body_text, attachments, body_html, cc):
         # Acquire token
         token = self._acquire_graph_token()
@@ -132,37 +282,74 @@ class Mailer:
         if cc:
             message["ccRecipients"] = [recip_obj(c) for c in cc]
 
-        # Attach files as fileAttachment with base64 content
-        if attachments:
-            atts = []
-            for path in attachments:
-                if not os.path.exists(path):
-                    continue
-                with open(path, 'rb') as f:
-                    data = f.read()
-                content_b64 = base64.b64encode(data).decode('ascii')
-                ctype, _ = mimetypes.guess_type(path)
-                atts.append({
-                    "@odata.type": "#microsoft.graph.fileAttachment",
-                    "name": os.path.basename(path),
-                    "contentBytes": content_b64,
-                })
-            if atts:
-                message['attachments'] = atts
-
-        payload = {"message": message, "saveToSentItems": True}
+        # Attach files inline as base64 fileAttachments; files too big for
+        # that are streamed to the message afterwards through upload sessions
+        inline = []
+        large = []
+        for path in attachments:
+            if not os.path.exists(path):
+                continue
+            if os.path.getsize(path) > GRAPH_INLINE_ATTACHMENT_LIMIT:
+                large.append(path)
+            else:
+                inline.append(path)
 
         # Send as the configured sender
         sender = (self.from_email or self.outlook_sender or '').strip()
-        if sender:
-            url = f'https://graph.microsoft.com/v1.0/users/{sender}/sendMail'
-        else:
-            url = 'https://graph.microsoft.com/v1.0/me/sendMail'
+        user_url = f'{GRAPH_API}/users/{sender}' if sender else f'{GRAPH_API}/me'
+
+        if large:
+            body = bytearray()
+            _write_graph_message(body, message, inline)
+            return self._send_graph_draft(user_url, headers, bytes(body), large)
 
-        resp = requests.post(url, headers=headers, data=json.dumps(payload), timeout=30)
+        # {"message": ..., "saveToSentItems": true}
+        body = bytearray(b'{"message":')
+        _write_graph_message(body, message, inline)
+        body += b',"saveToSentItems":true}'
+        resp = self._session.post(f'{user_url}/sendMail', headers=headers, data=bytes(body), timeout=30)
         if resp.status_code >= 400:
             raise RuntimeError(f'Graph sendMail failed: {resp.status_code} {resp.text}')
 
+    def _send_graph_draft(self, user_url, headers, message_json, large_attachments):
+        # Create a draft, stream the large files into it, then send it
+        resp = self._session.post(f'{user_url}/messages', headers=headers, data=message_json, timeout=30)
+        if resp.status_code >= 400:
+            raise RuntimeError(f'Graph draft creation failed: {resp.status_code} {resp.text}')
+        message_url = f"{user_url}/messages/{resp.json()['id']}"
+
+        for path in large_attachments:
+            self._graph_upload_attachment(message_url, headers, path)
+
+        resp = self._session.post(f'{message_url}/send', headers=headers, timeout=30)
+        if resp.status_code >= 400:
+            raise RuntimeError(f'Graph send failed: {resp.status_code} {resp.text}')
+
+    def _graph_upload_attachment(self, message_url, headers, path):
+        size = os.path.getsize(path)
+        session = {"AttachmentItem": {"attachmentType": "file", "name": os.path.basename(path), "size": size}}
+        resp = self._session.post(f'{message_url}/attachments/createUploadSession', headers=headers, data=_json_bytes(session), timeout=30)
+        if resp.status_code >= 400:
+            raise RuntimeError(f'Graph upload session failed: {resp.status_code} {resp.text}')
+        upload_url = resp.json()['uploadUrl']
+
+        # Chunks are read straight from disk; the upload URL is pre-authorised,
+        # so no bearer token is sent with them
+        offset = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(GRAPH_UPLOAD_CHUNK)
+                if not chunk:
+                    break
+                end = offset + len(chunk) - 1
+                resp = self._session.put(upload_url, data=chunk, timeout=60, headers={
+                    'Content-Length': str(len(chunk)),
+                    'Content-Range': f'bytes {offset}-{end}/{size}',
+                })
+                if resp.status_code >= 400:
+                    raise RuntimeError(f'Graph attachment upload failed: {resp.status_code} {resp.text}')
+                offset = end + 1
+
     # ---------- SMTP backend ----------
     def _connect_smtp(self):
         if not self.user or not self.pw:
@@ -177,6 +364,12 @@ class Mailer:
         return srv
 
     def _send_smtp(self, to_email, subject, body_text, attachments, body_html, cc):
+        msg, recipients = self._build_smtp_message(to_email, subject, body_text, attachments, body_html, cc)
+        with self._connect_smtp() as s:
+            s.send_message(msg, from_addr=self.from_email, to_addrs=recipients)
+
+    def _build_smtp_message(self, to_email, subject, body_text, attachments, body_html, cc):
+        """Return (EmailMessage, envelope recipients) for one SMTP send"""
         msg = EmailMessage()
         msg["Subject"] = subject
         msg["From"] = f"{self.from_name} <{self.from_email}>" if self.from_name else self.from_email
@@ -203,13 +396,8 @@ class Mailer:
             try:
                 if not path or not os.path.exists(path):
                     continue
-                ctype, _ = mimetypes.guess_type(path)
-                if not ctype:
-                    ctype = "application/octet-stream"
-                maintype, subtype = ctype.split("/", 1)
-                with open(path, "rb") as f:
-                    data = f.read()
-                msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=os.path.basename(path) or "attachment")
+                maintype, subtype = _guess_mime(path)
+                msg.add_attachment(_read_attachment(path), maintype=maintype, subtype=subtype, filename=os.path.basename(path) or "attachment")
             except Exception:
                 # skip problematic attachment
                 continue
@@ -217,31 +405,49 @@ class Mailer:
         # Build recipients (filter empty/None)
         recipients = [str(to_email)] + [str(b) for b in (self.bcc or []) if b] + cc_list
         recipients = [r for r in recipients if r]
-        with self._connect_smtp() as s:
-            s.send_message(msg, from_addr=self.from_email, to_addrs=list(dict.fromkeys(recipients)))
+        return msg, list(dict.fromkeys(recipients))
 
     # ---------- Outlook desktop backend (Windows only) ----------
-    def _send_outlook(self, to_email, subject, body_text, attachments, body_html, cc):
+    def _outlook_app(self):
+        # One Outlook connection (and account lookup) per Mailer. COM objects
+        # belong to the thread that created them, so reconnect on a new thread.
         import win32com.client as win32
-        import pythoncom, time
-        pythoncom.CoInitialize()
-        app = win32.Dispatch("Outlook.Application")
+        import pythoncom
+        thread_id = threading.get_ident()
+        if self._outlook is None or self._outlook_thread != thread_id:
+            pythoncom.CoInitialize()
+            try:
+                # early binding: faster attribute access than late Dispatch
+                app = win32.gencache.EnsureDispatch("Outlook.Application")
+            except Exception:
+                # gen_py cache unavailable (e.g. read-only in a frozen build)
+                app = win32.Dispatch("Outlook.Application")
+            accounts = {}
+            try:
+                items = app.Session.Accounts
+                for i in range(1, items.Count + 1):
+                    acct = items.Item(i)
+                    if acct.SmtpAddress:
+                        accounts[acct.SmtpAddress.lower()] = acct
+            except Exception:
+                pass
+            self._outlook, self._outlook_accounts, self._outlook_thread = app, accounts, thread_id
+        return self._outlook
+
+    def _send_outlook(self, to_email, subject, body_text, attachments, body_html, cc):
+        app = self._outlook_app()
         mail = app.CreateItem(0)  # olMailItem
 
         # Choose account if requested
         desired = (self.outlook_sender or "").lower()
-        try:
-            if desired:
-                accounts = app.Session.Accounts
-                for i in range(1, accounts.Count + 1):
-                    acct = accounts.Item(i)
-                    if acct.SmtpAddress and acct.SmtpAddress.lower() == desired:
-                        # SendUsingAccount
-                        mail._oleobj_.Invoke(0x0000F006, 0, 8, 0, acct)
-                        break
-        except Exception:
-            # fallback: default account
-            pass
+        acct = self._outlook_accounts.get(desired) if desired else None
+        if acct is not None:
+            try:
+                # SendUsingAccount
+                mail._oleobj_.Invoke(0x0000F006, 0, 8, 0, acct)
+            except Exception:
+                # fallback: default account
+                pass
 
         mail.To = to_email
         if cc:
@@ -1,8 +1,82 @@
 import csv
+import io
 import os
+import time
+import codecs
+import locale
+import tarfile
+import functools
+import itertools
+import contextlib
+import multiprocessing
 from datetime import datetime
 
+# Optional: NumPy computes pay for a whole block of CSV rows at once; without
+# it each row is computed on its own with plain floats.
+HAS_NUMPY = False
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except Exception:
+    np = None
+
+# Optional: pyarrow parses the CSV in native code, a record batch at a time.
+HAS_PYARROW = False
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except Exception:
+    pa = None
+    pa_csv = None
+
+COMPANY_NAME = "Tech Solutions Inc."
+# Employee CSV columns in Employee argument order; the last two are optional
+EMPLOYEE_CSV_COLUMNS = ('Employee Name', 'Employee ID', 'Hourly Rate', 'Hours Worked', 'Department', 'Position')
+# Below this many employees (CSV rows), starting worker processes costs more
+# than it saves; used by both the command line and the GUI generator
+PARALLEL_MIN_ROWS = 1000
+# CSV rows computed and written together; also the unit of work for pool workers
+BLOCK_ROWS = 256
+# Deductions in payslip order: (type, share of gross pay, fixed amount)
+_DEDUCTIONS = (
+    ('Federal Tax', 0.20, 0.0),
+    ('State Tax', 0.05, 0.0),
+    ('Social Security', 0.062, 0.0),
+    ('Medicare', 0.0145, 0.0),
+    ('Health Insurance', 0.0, 75.00),
+    ('Retirement (401k)', 0.05, 0.0),
+)
+_DEDUCTION_TYPES = tuple(kind for kind, _, _ in _DEDUCTIONS)
+# Rates shown next to the tax and social insurance deductions on the payslip
+_DEDUCTION_RATE_LABELS = {
+    'Federal Tax': ' (20%)',
+    'State Tax': ' (5%)',
+    'Social Security': ' (6.2%)',
+    'Medicare': ' (1.45%)',
+}
+# Payslip rules
+SEP = '=' * 50
+SUB = '-' * 50
+
+def pay_dates(now=None):
+    """
+    (pay period, pay date, file name stamp) for payslips issued at `now`.
+    Batches compute this once and pass it to every Payslip.
+    """
+    return _pay_dates_for((now or datetime.now()).date())
+
+@functools.lru_cache(maxsize=1)
+def _pay_dates_for(day):
+    # The strings only depend on the day, so strftime (and its locale lookups)
+    # runs once per day rather than once per Payslip
+    return day.strftime("%B %Y"), day.strftime("%B %d, %Y"), day.strftime('%Y%m%d')
+
 class Employee:
+    # No per-instance __dict__: rosters can hold many thousands of these
+    __slots__ = ('name', 'employee_id', 'hourly_rate', 'hours_worked', 'department',
+                 'position', 'overtime_hours', 'regular_hours')
+
     def __init__(self, name, employee_id, hourly_rate, hours_worked, department="", position=""):
         self.name = name
         self.employee_id = employee_id
@@ -14,145 +88,308 @@ class Employee:
         self.regular_hours = min(self.hours_worked, 40)
 
 class Payslip:
-    def __init__(self, employee, company_name="Tech Solutions Inc."):
+    __slots__ = ('employee', 'company_name', 'pay_period', 'pay_date', 'file_stamp',
+                 '_pay', 'deductions', 'net_pay')
+
+    def __init__(self, employee, company_name=COMPANY_NAME, dates=None):
         self.employee = employee
         self.company_name = company_name
-        self.pay_period = datetime.now().strftime("%B %Y")
-        self.pay_date = datetime.now().strftime("%B %d, %Y")
+        self.pay_period, self.pay_date, self.file_stamp = dates or pay_dates()
 
-        # Pay calculations
-        self.regular_pay = self.employee.regular_hours * self.employee.hourly_rate
-        self.overtime_pay = self.employee.overtime_hours * (self.employee.hourly_rate * 1.5)
-        self.gross_pay = self.regular_pay + self.overtime_pay
+        # Pay calculations, done the first time any of the pay is read
+        self._pay = None
 
         # Deductions
         self.deductions = {}
         self.net_pay = 0
 
-    def calculate_deductions(self):
-        """Calculate various deductions"""
-        # Federal Tax (20% of gross pay)
-        self.deductions['Federal Tax'] = self.gross_pay * 0.20
-
-        # State Tax (5% of gross pay)
-        self.deductions['State Tax'] = self.gross_pay * 0.05
-
-        # Social Security (6.2% of gross pay)
-        self.deductions['Social Security'] = self.gross_pay * 0.062
+    def _pay_figures(self):
+        """(regular_pay, overtime_pay, gross_pay, net_pay), computed once"""
+        if self._pay is None:
+            self._pay = _compute_pay(self.employee.hourly_rate, self.employee.hours_worked)
+        return self._pay
 
-        # Medicare (1.45% of gross pay)
-        self.deductions['Medicare'] = self.gross_pay * 0.0145
+    # Plain properties over _pay: functools.cached_property needs a __dict__
+    @property
+    def regular_pay(self):
+        return self._pay_figures()[0]
 
-        # Health Insurance (fixed amount)
-        self.deductions['Health Insurance'] = 75.00
+    @property
+    def overtime_pay(self):
+        return self._pay_figures()[1]
 
-        # Retirement (401k - 5% of gross pay)
-        self.deductions['Retirement (401k)'] = self.gross_pay * 0.05
+    @property
+    def gross_pay(self):
+        return self._pay_figures()[2]
 
+    def calculate_deductions(self):
+        """Calculate various deductions (itemised; net pay doesn't need them)"""
+        self.deductions = _deductions_for(self.gross_pay)
         return self.deductions
 
     def calculate_net_pay(self):
         """Calculate net pay after deductions"""
-        total_deductions = sum(self.deductions.values())
-        self.net_pay = self.gross_pay - total_deductions
+        self.net_pay = self._pay_figures()[3]
         return self.net_pay
 
     def generate_payslip(self):
         """Generate formatted payslip based on template"""
-        payslip_text = f"""
-{'='*50}
-                PAYSLIP
-{'='*50}
+        employee = self.employee
+        regular_pay, overtime_pay, gross_pay, _ = self._pay_figures()
+        return _payslip_text(
+            self.company_name, self.pay_period, self.pay_date,
+            employee.name, employee.employee_id, employee.department, employee.position,
+            employee.regular_hours, employee.overtime_hours, employee.hourly_rate,
+            regular_pay, overtime_pay, gross_pay,
+            self.deductions or self.calculate_deductions(), self.net_pay,
+        )
+
+    def save_to_file(self, filename=None, text=None):
+        """Save payslip to a text file; pass text if generate_payslip() was already called"""
+        if filename is None:
+            filename = f"payslip_{self.employee.employee_id}_{self.file_stamp}.txt"
+        if text is None:
+            text = self.generate_payslip()
 
-{self.company_name}
-PAY PERIOD: {self.pay_period}
-PAY DATE: {self.pay_date}
+        with open(filename, 'wb', buffering=1 << 16) as f:
+            f.write(text.encode('utf-8'))
 
-EMPLOYEE INFORMATION:
-Name: {self.employee.name}
-Employee ID: {self.employee.employee_id}
-Department: {self.employee.department}
-Position: {self.employee.position}
+        return filename
 
-PAY DETAILS:
-{'-'*50}
-Regular Hours: {self.employee.regular_hours} hours
-Hourly Rate: ${self.employee.hourly_rate:.2f}
-"""
+def _total_deductions(gross_pay):
+    """
+    Sum of all deductions from a gross pay, added up item by item in payslip
+    order; a combined rate would round some totals to a different cent
+    """
+    return sum(gross_pay * share + fixed for _, share, fixed in _DEDUCTIONS)
+
+def _compute_pay(hourly_rate, hours_worked):
+    """(regular_pay, overtime_pay, gross_pay, net_pay) for one employee"""
+    regular_pay = min(hours_worked, 40.0) * hourly_rate
+    overtime_pay = max(hours_worked - 40.0, 0.0) * (hourly_rate * 1.5)
+    gross_pay = regular_pay + overtime_pay
+    return regular_pay, overtime_pay, gross_pay, gross_pay - _total_deductions(gross_pay)
+
+def _deductions_for(gross_pay):
+    """Deductions taken from a gross pay, in payslip order"""
+    return {kind: gross_pay * share + fixed for kind, share, fixed in _DEDUCTIONS}
+
+def payroll_arrays(rates, hours):
+    """
+    Pay for many employees at once, from float64 arrays of hourly rates and
+    hours worked. Returns (regular_pay, overtime_pay, gross_pay, net_pay,
+    deductions) arrays, deductions being one row of _DEDUCTIONS per employee.
+    Uses the same operations as Payslip, so every value matches it. Requires NumPy.
+    """
+    regular_pay = np.minimum(hours, 40.0) * rates
+    overtime_pay = np.maximum(hours - 40.0, 0.0) * (rates * 1.5)
+    gross_pay = regular_pay + overtime_pay
+    shares = np.array([share for _, share, _ in _DEDUCTIONS])
+    fixed = np.array([fixed for _, _, fixed in _DEDUCTIONS])
+    deductions = gross_pay[:, None] * shares + fixed
+    # Added up a column at a time in payslip order, as _total_deductions does
+    total_deductions = np.zeros_like(gross_pay)
+    for amounts in deductions.T:
+        total_deductions += amounts
+    net_pay = gross_pay - total_deductions
+    return regular_pay, overtime_pay, gross_pay, net_pay, deductions
+
+# Payslip layout, filled in by _payslip_text with str.format_map
+PAYSLIP_TEMPLATE = """
+{sep}
+                PAYSLIP
+{sep}
 
-        if self.employee.overtime_hours > 0:
-            payslip_text += f"""Overtime Hours: {self.employee.overtime_hours} hours
-Overtime Rate: ${self.employee.hourly_rate * 1.5:.2f}
+{company_name}
+PAY PERIOD: {pay_period}
+PAY DATE: {pay_date}
 
-"""
-        else:
-            payslip_text += "\n"
+EMPLOYEE INFORMATION:
+Name: {name}
+Employee ID: {employee_id}
+Department: {department}
+Position: {position}
 
-        payslip_text += f"""GROSS PAY CALCULATION:
-Regular Pay: ${self.regular_pay:.2f}
-Overtime Pay: ${self.overtime_pay:.2f}
-Gross Pay: ${self.gross_pay:.2f}
+PAY DETAILS:
+{sub}
+Regular Hours: {regular_hours} hours
+Hourly Rate: ${hourly_rate:.2f}
+{overtime}GROSS PAY CALCULATION:
+Regular Pay: ${regular_pay:.2f}
+Overtime Pay: ${overtime_pay:.2f}
+Gross Pay: ${gross_pay:.2f}
 
 DEDUCTIONS:
-{'-'*50}
-"""
+{sub}
+{deduction_lines}
+Total Deductions: -${total_deductions:.2f}
 
-        for deduction_type, amount in self.deductions.items():
-            if 'Tax' in deduction_type or 'Social' in deduction_type or 'Medicare' in deduction_type:
-                rate = ""
-                if 'Federal' in deduction_type:
-                    rate = " (20%)"
-                elif 'State' in deduction_type:
-                    rate = " (5%)"
-                elif 'Social' in deduction_type:
-                    rate = " (6.2%)"
-                elif 'Medicare' in deduction_type:
-                    rate = " (1.45%)"
-                payslip_text += f"{deduction_type}{rate}: -${amount:.2f}\n"
-            else:
-                payslip_text += f"{deduction_type}: -${amount:.2f}\n"
-
-        payslip_text += f"""
-Total Deductions: -${sum(self.deductions.values()):.2f}
-
-NET PAY: ${self.net_pay:.2f}
-{'='*50}
+NET PAY: ${net_pay:.2f}
+{sep}
 
 Payment Method: Direct Deposit
 Account: ****-****-****-1234
 
 For questions about this payslip, contact HR at hr@techsolutions.com
 
-{'='*50}
+{sep}
 """
-        return payslip_text
-
-    def save_to_file(self, filename=None):
-        """Save payslip to a text file"""
-        if filename is None:
-            filename = f"payslip_{self.employee.employee_id}_{datetime.now().strftime('%Y%m%d')}.txt"
+# Overtime lines, only present when overtime was worked
+OVERTIME_TEMPLATE = """Overtime Hours: {overtime_hours} hours
+Overtime Rate: ${overtime_rate:.2f}
 
-        with open(filename, 'w') as f:
-            f.write(self.generate_payslip())
+"""
 
-        return filename
+def _payslip_text(company_name, pay_period, pay_date, name, employee_id, department, position,
+                  regular_hours, overtime_hours, hourly_rate,
+                  regular_pay, overtime_pay, gross_pay, deductions, net_pay):
+    """Format one payslip from already computed figures"""
+    if overtime_hours > 0:
+        overtime = OVERTIME_TEMPLATE.format(overtime_hours=overtime_hours, overtime_rate=hourly_rate * 1.5)
+    else:
+        overtime = "\n"
+
+    deduction_lines = ''.join(
+        f"{deduction_type}{_DEDUCTION_RATE_LABELS.get(deduction_type, '')}: -${amount:.2f}\n"
+        for deduction_type, amount in deductions.items()
+    )
+
+    return PAYSLIP_TEMPLATE.format_map({
+        'sep': SEP,
+        'sub': SUB,
+        'company_name': company_name,
+        'pay_period': pay_period,
+        'pay_date': pay_date,
+        'name': name,
+        'employee_id': employee_id,
+        'department': department,
+        'position': position,
+        'regular_hours': regular_hours,
+        'hourly_rate': hourly_rate,
+        'overtime': overtime,
+        'regular_pay': regular_pay,
+        'overtime_pay': overtime_pay,
+        'gross_pay': gross_pay,
+        'deduction_lines': deduction_lines,
+        'total_deductions': sum(deductions.values()),
+        'net_pay': net_pay,
+    })
+
+def iter_csv_rows(filename):
+    """
+    Yield (name, employee_id, hourly_rate, hours_worked, department, position)
+    tuples from an employee CSV, one row at a time. Rate and hours are
+    strings, or floats when pyarrow parsed them.
+    """
+    if HAS_PYARROW:
+        return _iter_csv_rows_arrow(filename)
+    return _read_csv_rows(filename)
+
+def _read_csv_rows(filename):
+    """iter_csv_rows with the csv module"""
+    with open(filename, 'r', newline='') as file:
+        # Column positions are looked up once from the header; DictReader
+        # would build a dict for every row
+        index = {column: i for i, column in enumerate(next(csv.reader(file), []))}
+        name_i = index['Employee Name']
+        id_i = index['Employee ID']
+        rate_i = index['Hourly Rate']
+        hours_i = index['Hours Worked']
+        dept_i = index.get('Department', -1)
+        pos_i = index.get('Position', -1)
+        for row in _split_csv_lines(file):
+            if not row:
+                continue
+            width = len(row)
+            yield (row[name_i], row[id_i], row[rate_i], row[hours_i],
+                   row[dept_i] if 0 <= dept_i < width else '',
+                   row[pos_i] if 0 <= pos_i < width else '')
+
+def _iter_csv_rows_arrow(filename):
+    """iter_csv_rows, with pyarrow's multithreaded parser doing the work"""
+    for batch in _iter_arrow_batches(filename):
+        data = batch.to_pydict()
+        blank = [''] * batch.num_rows
+        yield from zip(
+            data['Employee Name'],
+            data['Employee ID'],
+            data['Hourly Rate'],
+            data['Hours Worked'],
+            data.get('Department', blank),
+            data.get('Position', blank),
+        )
+
+def _iter_arrow_batches(filename):
+    """
+    pyarrow record batches of the employee columns of a CSV. From the first
+    block pyarrow won't take (a row stopping short of the optional columns, a
+    rate that isn't a number) the rest is read by the csv module, so the rows
+    accepted and errors raised are the same as without pyarrow.
+    Under a platform encoding other than UTF-8 the csv module reads it all.
+    """
+    with open(filename, 'r', newline='') as file:
+        header = next(csv.reader(file), [])
+    for column in EMPLOYEE_CSV_COLUMNS[:4]:
+        if column not in header:
+            raise KeyError(column)
+    columns = [c for c in EMPLOYEE_CSV_COLUMNS if c in header]
+
+    done = 0
+    # pyarrow reads UTF-8 itself but decodes anything else (cp1252 on Windows)
+    # by calling back into Python's codecs from its reader threads, which
+    # gains nothing and has aborted the interpreter at exit when polars is
+    # loaded too; the csv module reads those files as open() would
+    if codecs.lookup(locale.getpreferredencoding(False)).name == 'utf-8':
+        # Only the employee columns are converted, with their types given up front;
+        # float64 so rates and hours are the same values float() would give
+        convert_options = pa_csv.ConvertOptions(
+            column_types={c: pa.float64() if c in ('Hourly Rate', 'Hours Worked') else pa.string() for c in columns},
+            include_columns=columns,
+            # Only empty cells are missing; float() reads 'nan' and rejects 'NA'
+            null_values=[''],
+        )
+        try:
+            with pa.memory_map(filename) as source:
+                for batch in pa_csv.open_csv(source, convert_options=convert_options):
+                    if batch.column('Hourly Rate').null_count or batch.column('Hours Worked').null_count:
+                        # float('') raises on the csv path; let it, at the right row
+                        break
+                    yield batch
+                    done += batch.num_rows
+                else:
+                    return
+        except pa.ArrowInvalid:
+            pass
+
+    rows = itertools.islice(_read_csv_rows(filename), done, None)
+    for block in iter(lambda: list(itertools.islice(rows, BLOCK_ROWS)), []):
+        names, ids, rates, hours, departments, positions = zip(*block)
+        yield pa.record_batch([
+            pa.array(names, pa.string()),
+            pa.array(ids, pa.string()),
+            pa.array([float(rate) for rate in rates], pa.float64()),
+            pa.array([float(worked) for worked in hours], pa.float64()),
+            pa.array(departments, pa.string()),
+            pa.array(positions, pa.string()),
+        ], names=list(EMPLOYEE_CSV_COLUMNS))
+
+def _split_csv_lines(file):
+    """Field lists for the remaining lines of a CSV file opened with newline=''"""
+    for line in file:
+        if '"' in line:
+            # Quoted fields (embedded commas, quotes or line breaks) need the
+            # csv module, which takes over for the rest of the file
+            yield from csv.reader(itertools.chain((line,), file))
+            return
+        line = line.rstrip('\r\n')
+        # Plain lines are just split on commas, skipping csv's per-character
+        # state machine; blank lines come out empty, as csv.reader has them
+        yield line.split(',') if line else []
 
 def load_employees_from_csv(filename):
     """Load employee data from CSV file"""
-    employees = []
     try:
-        with open(filename, 'r') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                employee = Employee(
-                    name=row['Employee Name'],
-                    employee_id=row['Employee ID'],
-                    hourly_rate=row['Hourly Rate'],
-                    hours_worked=row['Hours Worked'],
-                    department=row.get('Department', ''),
-                    position=row.get('Position', '')
-                )
-                employees.append(employee)
+        return [Employee(*row) for row in iter_csv_rows(filename)]
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         return []
@@ -163,39 +400,233 @@ def load_employees_from_csv(filename):
         print(f"Error reading CSV file: {e}")
         return []
 
-    return employees
+class EmployeeTable:
+    """
+    Employees held column by column: lists of names, IDs, departments and
+    positions, and float64 arrays of hourly rates and hours worked (lists of
+    floats without NumPy), so pay can be worked out a column at a time
+    """
+    __slots__ = ('names', 'ids', 'rates', 'hours', 'departments', 'positions')
+
+    def __init__(self, names, ids, rates, hours, departments, positions):
+        self.names = names
+        self.ids = ids
+        self.rates = rates
+        self.hours = hours
+        self.departments = departments
+        self.positions = positions
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a table from (name, employee_id, hourly_rate, hours_worked, department, position) rows"""
+        columns = [list(column) for column in zip(*rows)] or [[] for _ in cls.__slots__]
+        names, ids, rates, hours, departments, positions = columns
+        return cls(names, ids, _float_column(rates), _float_column(hours), departments, positions)
+
+    @classmethod
+    def from_arrow(cls, batch):
+        """Build a table from a pyarrow record batch, taking the number columns as they are"""
+        data = batch.to_pydict()
+        blank = [''] * batch.num_rows
+        return cls(
+            data['Employee Name'],
+            data['Employee ID'],
+            batch.column('Hourly Rate').to_numpy(),
+            batch.column('Hours Worked').to_numpy(),
+            data.get('Department', blank),
+            data.get('Position', blank),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        """A table of the employees in slice `index`"""
+        return EmployeeTable(*(getattr(self, column)[index] for column in self.__slots__))
+
+    def rows(self):
+        """(name, employee_id, hourly_rate, hours_worked, department, position) per employee"""
+        rates = self.rates.tolist() if HAS_NUMPY else self.rates
+        hours = self.hours.tolist() if HAS_NUMPY else self.hours
+        return zip(self.names, self.ids, rates, hours, self.departments, self.positions)
+
+    def pay(self):
+        """payroll_arrays for the whole table. Requires NumPy."""
+        return payroll_arrays(self.rates, self.hours)
+
+def _float_column(values):
+    if HAS_NUMPY:
+        return np.fromiter(map(float, values), dtype=np.float64, count=len(values))
+    return [float(value) for value in values]
+
+def _iter_employee_tables(filename, block_rows=BLOCK_ROWS):
+    """EmployeeTable blocks of up to block_rows employees from a CSV, in file order"""
+    if HAS_PYARROW and HAS_NUMPY:
+        # Rates and hours go straight from pyarrow's parsed columns into the table
+        for batch in _iter_arrow_batches(filename):
+            table = EmployeeTable.from_arrow(batch)
+            for start in range(0, len(table), block_rows):
+                yield table[start:start + block_rows]
+        return
+    rows = iter_csv_rows(filename)
+    for block in iter(lambda: list(itertools.islice(rows, block_rows)), []):
+        yield EmployeeTable.from_rows(block)
+
+def _write_payslip(context, row):
+    """
+    Compute and write the payslip for one CSV row, returning (name,
+    employee_id, saved) with saved as from _save_payslip_text; context is
+    (directory, company_name, pay_period, pay_date, stamp), directory being
+    the output directory with a trailing separator. Top-level so worker
+    processes can unpickle it.
+    """
+    directory, company_name, pay_period, pay_date, stamp = context
+    name, employee_id, hourly_rate, hours_worked, department, position = row
+
+    hourly_rate = float(hourly_rate)
+    hours_worked = float(hours_worked)
+    regular_pay, overtime_pay, gross_pay, net_pay = _compute_pay(hourly_rate, hours_worked)
+    deductions = _deductions_for(gross_pay)
+
+    text = _payslip_text(
+        company_name, pay_period, pay_date, name, employee_id, department, position,
+        # shown as Employee shows them (40, not 40.0, when capped)
+        min(hours_worked, 40), max(0, hours_worked - 40), hourly_rate,
+        regular_pay, overtime_pay, gross_pay, deductions, net_pay,
+    )
+    return name, employee_id, _save_payslip_text(directory, employee_id, stamp, text)
+
+def _write_payslip_block(context, table):
+    """
+    Compute and write the payslips for an EmployeeTable block, returning
+    what _write_payslip does for each; context is as for _write_payslip. With
+    NumPy the pay for the whole block is worked out in one go by payroll_arrays.
+    """
+    if not HAS_NUMPY:
+        return [_write_payslip(context, row) for row in table.rows()]
+
+    directory, company_name, pay_period, pay_date, stamp = context
+    regular_pay, overtime_pay, gross_pay, net_pay, deductions = table.pay()
+
+    written = []
+    # Only the text formatting runs per row; tolist() hands back plain floats
+    for (name, employee_id, department, position, hourly_rate, hours_worked,
+         regular, overtime, gross, net, amounts) in zip(
+            table.names, table.ids, table.departments, table.positions,
+            table.rates.tolist(), table.hours.tolist(),
+            regular_pay.tolist(), overtime_pay.tolist(), gross_pay.tolist(), net_pay.tolist(),
+            deductions.tolist()):
+        text = _payslip_text(
+            company_name, pay_period, pay_date, name, employee_id, department, position,
+            # shown as Employee shows them (40, not 40.0, when capped)
+            min(hours_worked, 40), max(0, hours_worked - 40), hourly_rate,
+            regular, overtime, gross, dict(zip(_DEDUCTION_TYPES, amounts)), net,
+        )
+        written.append((name, employee_id, _save_payslip_text(directory, employee_id, stamp, text)))
+    return written
+
+def _save_payslip_text(directory, employee_id, stamp, text):
+    """
+    Write a payslip into directory (ending in a path separator) and return
+    None; with directory None, return its (filename, data) instead for the
+    caller to store
+    """
+    filename = f"payslip_{employee_id}_{stamp}.txt"
+    # UTF-8 on every platform and no newline translation pass
+    data = text.encode('utf-8')
+    if directory is None:
+        return filename, data
+    # Plain concatenation: os.path.join is done once per run, not per payslip
+    with open(directory + filename, 'wb', buffering=1 << 16) as f:
+        f.write(data)
+
+def _archive_payslips(archive, written, mtime):
+    """Add a block's payslips to the archive, if any; yields (name, employee_id)"""
+    for name, employee_id, saved in written:
+        if archive is not None:
+            filename, data = saved
+            info = tarfile.TarInfo(filename)
+            info.size = len(data)
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(data))
+        yield name, employee_id
+
+def stream_payslips(csv_filename, output_dir, company_name=COMPANY_NAME, processes=None, archive=None):
+    """
+    Write a payslip for each CSV row as soon as it is read, without building
+    Employee/Payslip objects or holding the whole file in memory.
+    Yields (name, employee_id) for every payslip written.
+
+    Files of PARALLEL_MIN_ROWS rows or more are spread over a pool of
+    `processes` workers (default: one per CPU), and payslips then finish out
+    of order; processes=1 keeps everything in this process.
+
+    Given an open tarfile.TarFile as `archive`, payslips are added to it
+    instead of being written to output_dir one file each.
+    """
+    directory = os.path.join(output_dir, '') if archive is None else None
+    write = functools.partial(_write_payslip_block, (directory, company_name) + pay_dates())
+    mtime = time.time()
+
+    blocks = _iter_employee_tables(csv_filename)
+    head = []
+    while sum(map(len, head)) < PARALLEL_MIN_ROWS:
+        block = next(blocks, None)
+        if block is None:
+            break
+        head.append(block)
+    blocks = itertools.chain(head, blocks)
+    if processes == 1 or sum(map(len, head)) < PARALLEL_MIN_ROWS:
+        for block in blocks:
+            yield from _archive_payslips(archive, write(block), mtime)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for written in pool.imap_unordered(write, blocks):
+            yield from _archive_payslips(archive, written, mtime)
 
-def generate_payslips_from_csv(csv_filename, output_dir="payslips"):
-    """Generate payslips for all employees in CSV file"""
+def generate_payslips_from_csv(csv_filename, output_dir="payslips", processes=None, archive=False):
+    """
+    Generate payslips for all employees in CSV file; with archive=True they
+    all go into one payslips.tar in output_dir instead of a file each
+    """
     # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
-    # Load employees from CSV
-    employees = load_employees_from_csv(csv_filename)
+    if archive:
+        archive_path = os.path.join(output_dir, 'payslips.tar')
+        target = f"'{archive_path}'"
+    else:
+        target = f"'{output_dir}' directory"
+    print(f"Generating payslips from {csv_filename} in {target}...")
 
-    if not employees:
+    count = 0
+    error = None
+    try:
+        # closing() rather than the TarFile itself, which leaves the archive
+        # unfinished on an error; earlier payslips should still be readable
+        with contextlib.closing(tarfile.open(archive_path, 'w')) if archive else contextlib.nullcontext() as tar:
+            for name, employee_id in stream_payslips(csv_filename, output_dir, processes=processes, archive=tar):
+                count += 1
+                print(f"Generated payslip for {name} ({employee_id})")
+    except FileNotFoundError:
+        error = f"Error: File '{csv_filename}' not found."
+    except KeyError as e:
+        error = f"Error: Missing required column in CSV: {e}"
+    except Exception as e:
+        error = f"Error reading CSV file: {e}"
+
+    if error:
+        print(error)
+    if not count:
         print("No employees loaded. Please check your CSV file.")
         return
+    if error:
+        # Rows are written as they are read, so earlier payslips are already on disk
+        print(f"\nStopped after {count} payslips in {target}.")
+        return
 
-    print(f"Loaded {len(employees)} employees from {csv_filename}")
-    print(f"Generating payslips in '{output_dir}' directory...")
-
-    # Generate payslip for each employee
-    for employee in employees:
-        payslip = Payslip(employee)
-        payslip.calculate_deductions()
-        payslip.calculate_net_pay()
-
-        # Save payslip to file
-        filename = payslip.save_to_file()
-        full_path = os.path.join(output_dir, filename)
-        with open(full_path, 'w') as f:
-            f.write(payslip.generate_payslip())
-
-        print(f"Generated payslip for {employee.name} ({employee.employee_id})")
-
-    print(f"\nAll payslips generated successfully in '{output_dir}' directory!")
+    print(f"\nAll {count} payslips generated successfully in {target}!")
 
 def main():
     """Main function to run the payslip generator"""
@@ -218,7 +649,9 @@ def main():
         if not output_dir:
             output_dir = "payslips"
 
-        generate_payslips_from_csv(csv_file, output_dir)
+        archive = input("Write them all into one payslips.tar? (y/n, default: n): ").lower().strip() == 'y'
+
+        generate_payslips_from_csv(csv_file, output_dir, archive=archive)
 
     elif choice == '2':
         # Manual entry mode
@@ -242,11 +675,12 @@ def main():
         payslip.calculate_deductions()
         payslip.calculate_net_pay()
 
-        print("\n" + payslip.generate_payslip())
+        payslip_text = payslip.generate_payslip()
+        print("\n" + payslip_text)
 
         save_option = input("Save this payslip to file? (y/n): ").lower().strip()
         if save_option == 'y':
-            filename = payslip.save_to_file()
+            filename = payslip.save_to_file(text=payslip_text)
             print(f"Payslip saved as: {filename}")
 
     elif choice == '3':
@@ -266,4 +700,6 @@ def main():
         print("Invalid choice. Please try again.")
 
 if __name__ == "__main__":
+    # needed for multiprocessing.Pool when run as a frozen Windows executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
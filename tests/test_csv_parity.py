@@ -0,0 +1,100 @@
+"""Parity check for the GUI CSV loader: every engine (polars, pyarrow, the csv
+module) must load the same employees as a plain csv.DictReader does, including
+for files polars or pyarrow cannot parse themselves. Runs as a script or under
+pytest."""
+import os
+import sys
+import csv
+import tempfile
+import contextlib
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import main
+import gui_payslip
+
+HEADER = 'Employee Name,Employee ID,Hourly Rate,Hours Worked,Department,Position\n'
+CSV_FILES = {
+    'padded': HEADER + 'A,007, 25.00 ,40,D,P\nB,008,20, 45 ,D,P\n',
+    'cr_only': (HEADER + 'A,007,25,40,D,P\nB,008,20,45,D,P\n').replace('\n', '\r'),
+    'underscore': HEADER + 'A,007,1_000,40,D,P\n',
+    'empty_cells': HEADER + 'A,,25,40,,\n,008,20,45,D,P\n',
+    'null_words': HEADER + 'NA,N/A,25,40,nan,null\n',
+    'quoted': HEADER + '"Doe, J","007","25.5","40","D ""x""","P"\n',
+    # one padded cell at the very end of a file several chunks long
+    'large_padded': HEADER + 'A,1,25,40,D,P\n' * 12000 + 'B,2, 25 ,40,D,P\n',
+}
+# Rows of differing length; the csv.DictReader reference has None for missing
+# cells where the loader has ''
+RAGGED = HEADER + 'A,007,25,40\nB,008,20,45,D,P,extra\n\nC,009,30,50,D\n'
+RAGGED_EXPECTED = [
+    ('A', '007', 25.0, 40.0, '', ''),
+    ('B', '008', 20.0, 45.0, 'D', 'P'),
+    ('C', '009', 30.0, 50.0, 'D', ''),
+]
+
+
+def _fields(employee):
+    return (employee.name, employee.employee_id, employee.hourly_rate, employee.hours_worked,
+            employee.department, employee.position)
+
+
+def _reference(filename):
+    with open(filename, 'r', newline='') as f:
+        return [_fields(main.Employee(row['Employee Name'], row['Employee ID'], row['Hourly Rate'],
+                                      row['Hours Worked'], row.get('Department', ''), row.get('Position', '')))
+                for row in csv.DictReader(f)]
+
+
+@contextlib.contextmanager
+def _engine(polars, pyarrow):
+    saved = gui_payslip.HAS_POLARS, main.HAS_PYARROW
+    gui_payslip.HAS_POLARS = polars and saved[0]
+    main.HAS_PYARROW = pyarrow and saved[1]
+    try:
+        yield
+    finally:
+        gui_payslip.HAS_POLARS, main.HAS_PYARROW = saved
+
+
+ENGINES = {'polars': (True, True), 'pyarrow': (False, True), 'csv': (False, False)}
+
+
+def _load_all(content):
+    """Employees loaded by every engine, keyed by engine name"""
+    loader = gui_payslip.PayslipGeneratorGUI.__new__(gui_payslip.PayslipGeneratorGUI)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'employees.csv')
+        with open(filename, 'w', newline='') as f:
+            f.write(content)
+        loaded = {}
+        for name, (polars, pyarrow) in ENGINES.items():
+            with _engine(polars, pyarrow):
+                loaded[name] = [_fields(e) for e in loader.load_csv_data(filename)]
+        return loaded, _reference(filename)
+
+
+def test_engines_match_reference():
+    for label, content in CSV_FILES.items():
+        loaded, expected = _load_all(content)
+        for engine, employees in loaded.items():
+            assert employees == expected, (label, engine)
+
+
+def test_ragged_rows():
+    loaded, _ = _load_all(RAGGED)
+    for engine, employees in loaded.items():
+        assert employees == RAGGED_EXPECTED, engine
+
+
+if __name__ == '__main__':
+    failed = 0
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            try:
+                test()
+                print(f'{name}: PASS')
+            except AssertionError as e:
+                failed += 1
+                print(f'{name}: FAIL {e}')
+    sys.exit(1 if failed else 0)
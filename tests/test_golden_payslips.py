@@ -0,0 +1,93 @@
+"""Golden-output check: the payslips for employees.csv must match
+tests/golden/employees_payslips.txt byte for byte, so a figure that moves by
+a single cent fails. Runs as a script or under pytest."""
+import os
+import sys
+import tarfile
+import tempfile
+import contextlib
+import io
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import main
+
+EMPLOYEES_CSV = os.path.join(REPO, 'employees.csv')
+GOLDEN = os.path.join(REPO, 'tests', 'golden', 'employees_payslips.txt')
+# The golden payslips were written with these dates
+DATES = ('January 2025', 'January 15, 2025', '20250115')
+
+
+def _golden():
+    with open(GOLDEN, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def _employee_ids():
+    return [employee.employee_id for employee in main.load_employees_from_csv(EMPLOYEES_CSV)]
+
+
+@contextlib.contextmanager
+def _fixed_dates():
+    pay_dates = main.pay_dates
+    main.pay_dates = lambda now=None: DATES
+    try:
+        yield
+    finally:
+        main.pay_dates = pay_dates
+
+
+def _stream(archive=False):
+    """Payslips from generate_payslips_from_csv, concatenated in CSV order"""
+    with tempfile.TemporaryDirectory() as output_dir, _fixed_dates(), \
+            contextlib.redirect_stdout(io.StringIO()):
+        main.generate_payslips_from_csv(EMPLOYEES_CSV, output_dir, processes=1, archive=archive)
+        names = [f"payslip_{employee_id}_{DATES[2]}.txt" for employee_id in _employee_ids()]
+        if archive:
+            with tarfile.open(os.path.join(output_dir, 'payslips.tar')) as tar:
+                return ''.join(tar.extractfile(name).read().decode('utf-8') for name in names)
+        texts = []
+        for name in names:
+            with open(os.path.join(output_dir, name), 'r', encoding='utf-8', newline='') as f:
+                texts.append(f.read())
+        return ''.join(texts)
+
+
+def test_payslip_objects():
+    texts = []
+    for employee in main.load_employees_from_csv(EMPLOYEES_CSV):
+        payslip = main.Payslip(employee, dates=DATES)
+        payslip.calculate_deductions()
+        payslip.calculate_net_pay()
+        texts.append(payslip.generate_payslip())
+    assert ''.join(texts) == _golden()
+
+
+def test_stream_payslips():
+    assert _stream() == _golden()
+
+
+def test_stream_payslips_without_numpy():
+    has_numpy = main.HAS_NUMPY
+    main.HAS_NUMPY = False
+    try:
+        assert _stream() == _golden()
+    finally:
+        main.HAS_NUMPY = has_numpy
+
+
+def test_archive():
+    assert _stream(archive=True) == _golden()
+
+
+if __name__ == '__main__':
+    failed = 0
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            try:
+                test()
+                print(f'{name}: PASS')
+            except AssertionError:
+                failed += 1
+                print(f'{name}: FAIL')
+    sys.exit(1 if failed else 0)